@@ -19,12 +19,24 @@ export async function GET(request: Request) {
       )
     }
 
-    // If no ISIN is provided, return a list of up to 10 ETFs (for browsing/testing)
+    // If no ISIN is provided, return a list of ETFs:
+    // ?top=50&max_ter=0.3 ranks by Dividendenrendite (in the database, on the typed columns),
+    // without parameters up to 10 ETFs are returned (for browsing/testing)
     if (!isin) {
-      const { data, error } = await supabase
+      const top = Number.parseInt(searchParams.get('top') ?? '', 10)
+      const maxTer = Number.parseFloat(searchParams.get('max_ter') ?? '')
+      let query = supabase
         .from('etf_ausschuettend') // Table name
-        .select('isin, dividendenrendite') // Only select these columns
-        .limit(10)
+        .select('isin, dividendenrendite, dividendenrendite_pct, ter_pct') // Only select these columns
+      if (Number.isFinite(top) && top > 0) {
+        query = query
+          .not('dividendenrendite_pct', 'is', null)
+          .order('dividendenrendite_pct', { ascending: false })
+      }
+      if (Number.isFinite(maxTer)) {
+        query = query.lt('ter_pct', maxTer) // TER in percent, e.g. 0.3 for 0,3%
+      }
+      const { data, error } = await query.limit(Number.isFinite(top) && top > 0 ? Math.min(top, 500) : 10)
 
       if (error) {
         // If there was a database error, return a 500 error
@@ -61,6 +73,26 @@ export async function GET(request: Request) {
       )
     }
 
+    // ?history=1 adds the values after every change (etf_snapshot), e.g. for the yield trend:
+    // the latest 1000 snapshots, fetched newest first so the limit drops the oldest, returned oldest first
+    if (searchParams.get('history')) {
+      const { data: latest, error: historyError } = await supabase
+        .from('etf_snapshot')
+        .select('scraped_on, snapshot_at, dividendenrendite_pct, ter_pct, fondsgröße_mio_eur')
+        .eq('isin', isin)
+        .order('snapshot_at', { ascending: false })
+        .limit(1000)
+
+      if (historyError) {
+        return NextResponse.json(
+          { error: 'Database query failed' },
+          { status: 500 }
+        )
+      }
+      const history = (latest ?? []).reverse()
+      return NextResponse.json({ ...data, history })
+    }
+
     // Return the ETF data as JSON
     return NextResponse.json(data)
   } catch (error) {
@@ -0,0 +1,54 @@
+"""
+Child process of the cold_start benchmark stage (see run_benchmarks.py). Starts like a scraper run:
+imports scraper, resolves chromedriver (offline, from the cache or PATH), starts headless Chrome and loads
+a generated overview page from disk with driver.get. Prints one JSON line with the seconds since
+interpreter start at the end of each phase, as soon as the first driver.get returned.
+
+    python benchmarks/cold_start.py [--imports-only]
+"""
+import time
+
+START = time.perf_counter()
+
+import json  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+import tempfile  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    sys.path.insert(0, os.path.dirname(BENCH_DIR))
+    phases = {}
+    import scraper
+    phases['import'] = time.perf_counter() - START
+    if '--imports-only' in sys.argv:
+        print(json.dumps(phases), flush=True)
+        return
+
+    import chromedriver
+    chromedriver.OFFLINE = True  # Benchmarks must not depend on the network
+    driver = scraper.setup_driver(headless=True)
+    phases['driver_setup'] = time.perf_counter() - START
+    if driver is None:
+        phases['error'] = "driver setup failed"
+        print(json.dumps(phases), flush=True)
+        return
+    sys.path.insert(0, BENCH_DIR)
+    from fixtures import generate_overview_html
+
+    html, _ = generate_overview_html(num_tables=2, rows_per_table=10)
+    with tempfile.NamedTemporaryFile('w', suffix='.html', delete=False, encoding='utf-8') as f:
+        f.write(html)
+    try:
+        driver.get(f"file://{f.name}")
+        phases['first_get'] = time.perf_counter() - START
+        print(json.dumps(phases), flush=True)
+    finally:
+        driver.quit()
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main()
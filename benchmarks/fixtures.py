@@ -0,0 +1,180 @@
+"""
+Offline fixtures for the benchmark suite.
+
+Saved snapshots in benchmarks/fixtures/ are used when present:
+    overview*.html   overview page (all tables loaded), e.g. driver.page_source after clicking the anchors
+    profile*.html    ETF profile pages
+    *.pdf            factsheets
+Anything missing is generated deterministically, so the suite always runs without network.
+"""
+import glob
+import os
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+ISSUERS = ["iShares", "Vanguard", "Xtrackers", "Amundi", "SPDR", "VanEck", "Invesco", "HSBC"]
+REGIONS = ["Afrika", "Asien Pazifik", "China", "Deutschland", "Europa", "Japan", "Schwellenländer", "USA", "Welt",
+           "Digitalisierung", "Gesundheit", "Immobilien", "Infrastruktur", "Rohstoffe", "Technologie", "Versorger"]
+
+
+def _isin(rng):
+    return "IE00" + "".join(rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ0123456789") for _ in range(8))
+
+
+def _german_number(value, decimals=2):
+    return f"{value:,.{decimals}f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def generate_overview_html(num_tables=16, rows_per_table=60, seed=1):
+    """
+    Generates an overview page in the justetf markup parse_tables_html expects: an h3 per table followed by a
+    striped DataTables table whose rows have 8+ columns. About half of the rows are distributing, some link
+    to a savings plan (the <i> marker) and are skipped by the parser.
+    Returns:
+        tuple: (html, list of table names)
+    """
+    rng = random.Random(seed)
+    table_names = [f"Aktien {REGIONS[i % len(REGIONS)]}" + (f" {i // len(REGIONS) + 1}" if i >= len(REGIONS) else "")
+                   for i in range(num_tables)]
+    parts = ["<html><head><title>ETF Übersicht</title></head><body>",
+             "<nav>" + "".join(f'<a class="light-link" href="#aktien_{i}">{name}</a>'
+                               for i, name in enumerate(table_names)) + "</nav>"]
+    for name in table_names:
+        parts.append(f"<div class='section'><h3>{name}</h3><p>Die besten {name} ETFs im Vergleich.</p>")
+        parts.append('<table class="table table-striped dataTable no-footer"><thead><tr>'
+                     + "".join(f"<th>{h}</th>" for h in ["Name", "TER", "1J", "Fondsgröße", "Auflage",
+                                                          "Ertragsverwendung", "Replikation", "ISIN", "Aktion"])
+                     + "</tr></thead><tbody>")
+        for n in range(rows_per_table):
+            issuer = rng.choice(ISSUERS)
+            isin = _isin(rng)
+            distributing = rng.random() < 0.5
+            sparplan = '<i class="fa fa-star"></i>' if rng.random() < 0.1 else ""
+            cells = [
+                f'<a href="/de/etf-profile.html?isin={isin}">{issuer} {name} UCITS ETF {n}{sparplan}</a>',
+                f"{_german_number(rng.uniform(0.05, 0.9))}%",
+                f"{_german_number(rng.uniform(-20, 40))}%",
+                f"{_german_number(rng.randint(5, 20000), 0)} Mio. €",
+                f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(2000, 2024)}",
+                "Ausschüttend" if distributing else "Thesaurierend",
+                rng.choice(["Physisch (Vollständig)", "Physisch (Sampling)", "Synthetisch (Swap)"]),
+                isin,
+                '<button class="btn">Vergleichen</button>',
+            ]
+            parts.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+        parts.append("</tbody></table></div>")
+    parts.append("<footer>" + "<p>Lorem ipsum dolor sit amet.</p>" * 200 + "</footer></body></html>")
+    return "".join(parts), table_names
+
+
+def generate_profile_html(isin, with_factsheet=True):
+    """Generates an ETF profile page with (or without) the "Factsheet (DE)" download link."""
+    links = [
+        f'<a class="download-link" title="KID" href="/servlet/download?isin={isin}&amp;doc=kid">KID</a>',
+        f'<a class="download-link" title="Jahresbericht" href="/servlet/download?isin={isin}&amp;doc=ar">Jahresbericht</a>',
+    ]
+    if with_factsheet:
+        links.append(f'<a class="download-link" title="Factsheet (DE)" '
+                     f'href="/servlet/download?isin={isin}&amp;doc=fs_de"><span>Factsheet (DE)</span></a>')
+    return (
+        f"<html><head><title>{isin}</title><script>var x = 1;</script></head><body><h1>ETF {isin}</h1>"
+        + "<div class='row'>" + "<p>Beschreibung des Index und der Anlagestrategie.</p>" * 150 + "</div>"
+        + "<div class='documents'>" + "".join(links) + "</div>"
+        + "<table>" + "<tr><td>Kennzahl</td><td>Wert</td></tr>" * 100 + "</table></body></html>"
+    )
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages):
+    """
+    Writes a minimal, valid PDF with one Helvetica text line per entry.
+    Args:
+        pages (list of list of str): Text lines per page.
+    Returns:
+        bytes: The PDF file content.
+    """
+    objects = []  # object bodies, object number = index + 1
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    pages_num = len(objects) + 1
+    objects.append(None)  # Pages tree, filled in once the kids are known
+    kids = []
+    for lines in pages:
+        stream = ["BT", "/F1 10 Tf", "12 TL", "50 800 Td"]
+        for line in lines:
+            stream.append(f"({_pdf_escape(line)}) Tj T*")
+        stream.append("ET")
+        content = "\n".join(stream).encode("cp1252", errors="replace")
+        content_num = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 %d 0 R >> >> "
+            b"/Contents %d 0 R >>" % (pages_num, font, content_num)
+        ))
+    objects[pages_num - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_num)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+
+def generate_factsheet(seed):
+    """
+    Generates a factsheet PDF in one of several layouts (yield on page 1 same line, next line, only on a later
+    page, only 'Rendite', or none at all).
+    Returns:
+        tuple: (pdf bytes, expected extraction result)
+    """
+    rng = random.Random(seed)
+    issuer = rng.choice(ISSUERS)
+    value = f"{_german_number(rng.uniform(0.5, 6.5))}%"
+    filler = [f"{issuer} Index Fund - Anteilsklasse {rng.randint(1, 9)}", "Anlageziel und Anlagepolitik",
+              "Der Fonds bildet die Wertentwicklung des Index nach.", "Wertentwicklung in %",
+              "1 Monat 3 Monate 1 Jahr 3 Jahre 5 Jahre", "Risikoindikator 1 2 3 4 5 6 7"]
+    holdings = [f"{rng.choice(['Apple', 'Microsoft', 'Nestle', 'Siemens', 'Toyota', 'Samsung'])} {w}"
+                for w in ("4,12%", "3,80%", "2,95%", "2,10%", "1,75%")]
+    layout = rng.choice(["same_line", "same_line", "same_line", "next_line", "later_page", "rendite", "none"])
+    page1 = list(filler) + ["Fondsdaten", f"Gesamtkostenquote (TER) {_german_number(rng.uniform(0.05, 0.6))}%",
+                            f"Fondsvolumen {rng.randint(50, 9000)} Mio. EUR", "Ausschüttungsintervall Vierteljährlich"]
+    later = ["Top 10 Positionen"] + holdings + ["Länderaufteilung", "USA 62,10%", "Japan 6,00%"]
+    expected = value
+    if layout == "same_line":
+        page1.append(f"Dividendenrendite {value}")
+    elif layout == "next_line":
+        page1 += ["Dividendenrendite", value]
+    elif layout == "later_page":
+        later.append(f"Dividendenrendite: {value}")
+    elif layout == "rendite":
+        page1.append(f"Rendite p.a. {value}")
+    else:
+        expected = "no DivRendite found"
+    pages = [page1 + filler * 4, later + filler * 6, filler * 8]
+    return make_pdf(pages), expected
+
+
+def load_saved(pattern):
+    """Returns the contents of saved fixture files matching pattern (sorted by name)."""
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, pattern)))
+    contents = []
+    for path in paths:
+        mode = "rb" if path.endswith(".pdf") else "r"
+        with open(path, mode, **({} if mode == "rb" else {"encoding": "utf-8"})) as f:
+            contents.append(f.read())
+    return contents
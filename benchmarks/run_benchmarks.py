@@ -0,0 +1,311 @@
+"""
+Offline benchmarks for the scraper's hot paths. No network, browser or Supabase is needed.
+
+Stages:
+    parse_tables   parse_tables_html on an overview page, once per table
+    profile        extract_factsheet_url on ETF profile pages
+    pdf_extract    extract_dividendenrendite_from_pdf on a factsheet corpus (results are checked)
+    pdf_templates  pdf_extract with a fresh layout template store (the first round learns, the others use it)
+    pdf_fields     extract_fields_from_pdf (every registered field) on the same corpus
+    db_write       insert_etf_entries into SQLite (default) or a local Postgres (--db-url)
+    cold_start     fresh interpreter to the first driver.get (headless Chrome, chromedriver from cache/PATH);
+                   with --imports-only to the end of 'import scraper'
+
+Usage:
+    python benchmarks/run_benchmarks.py                    # run and compare against benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline    # run and store the result as the new baseline
+    python benchmarks/run_benchmarks.py --stages pdf_extract --pdfs 100
+
+Exits with 1 if a stage's p50 latency or throughput is more than --threshold worse than the baseline, or,
+with --require-baseline (for CI gates), if there is no baseline to compare against.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from fixtures import generate_overview_html, generate_profile_html, generate_factsheet, load_saved  # noqa: E402
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+REGRESSION_THRESHOLD = 0.25  # A stage fails if it is more than 25% slower than the baseline
+STAGES = ("parse_tables", "profile", "pdf_extract", "pdf_templates", "pdf_fields", "db_write", "cold_start")
+COLD_START_SCRIPT = os.path.join(BENCH_DIR, "cold_start.py")
+
+log = logging.getLogger("benchmarks")
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def measure(name, items, func, repeat=1):
+    """
+    Calls func(item) for every item (repeat times) and times each call.
+    Returns:
+        tuple: (stats dict, list of results of the last round)
+    """
+    latencies = []
+    results = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = []
+        for item in items:
+            call_start = time.perf_counter()
+            results.append(func(item))
+            latencies.append(time.perf_counter() - call_start)
+    return summarize(name, latencies, time.perf_counter() - start), results
+
+
+def summarize(name, latencies, total):
+    """
+    Returns:
+        dict: count, total, throughput and p50/p95/p99/max latency of one stage.
+    """
+    ordered = sorted(latencies)
+    stats = {
+        'count': len(latencies),
+        'total_s': round(total, 4),
+        'throughput_per_s': round(len(latencies) / total, 2) if total else 0.0,
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+    }
+    log.info(
+        f"{name}: {stats['count']} calls, {stats['throughput_per_s']}/s, p50 {stats['p50_ms']} ms, "
+        f"p95 {stats['p95_ms']} ms, max {stats['max_ms']} ms"
+    )
+    return stats
+
+
+def bench_parse_tables(args):
+    from scraper import parse_tables_html
+
+    saved = load_saved("overview*.html")
+    if saved:
+        # Saved snapshots: parse the first table of each page
+        items = [(html, None) for html in saved]
+    else:
+        html, table_names = generate_overview_html(num_tables=args.tables, rows_per_table=args.rows)
+        items = [(html, name) for name in table_names]
+    stats, results = measure("parse_tables", items, lambda item: parse_tables_html(*item), repeat=args.repeat)
+    stats['rows'] = sum(len(rows) for rows in results)
+    return stats, [etf for rows in results for etf in rows]
+
+
+def bench_profile(args):
+    from scraper import extract_factsheet_url
+
+    pages = load_saved("profile*.html") or [
+        generate_profile_html(f"IE00BENCH{n:04d}", with_factsheet=n % 10 != 0) for n in range(args.profiles)
+    ]
+    stats, results = measure("profile", pages, extract_factsheet_url, repeat=args.repeat)
+    stats['links_found'] = sum(1 for url in results if url)
+    return stats
+
+
+def factsheet_corpus(args):
+    """Returns a list of (pdf bytes, expected Dividendenrendite or None): saved factsheets, or generated ones."""
+    saved = load_saved("*.pdf")
+    if saved:
+        return [(pdf, None) for pdf in saved]
+    return [generate_factsheet(seed) for seed in range(args.pdfs)]
+
+
+def count_mismatches(name, corpus, results):
+    mismatches = [
+        (n, expected, result) for n, ((_, expected), result) in enumerate(zip(corpus, results))
+        if expected is not None and expected != result
+    ]
+    for n, expected, result in mismatches[:5]:
+        log.error(f"{name}: factsheet {n} returned {result!r}, expected {expected!r}")
+    return len(mismatches)
+
+
+def bench_pdf_extract(args):
+    from handle_pdf import extract_dividendenrendite_from_pdf
+
+    corpus = factsheet_corpus(args)
+    stats, results = measure(
+        "pdf_extract", [pdf for pdf, _ in corpus], extract_dividendenrendite_from_pdf, repeat=args.repeat
+    )
+    stats['mismatches'] = count_mismatches("pdf_extract", corpus, results)
+    return stats
+
+
+def bench_pdf_templates(args):
+    from handle_pdf import extract_dividendenrendite_from_pdf
+    from layout_templates import LayoutTemplateStore
+
+    corpus = factsheet_corpus(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        templates = LayoutTemplateStore(os.path.join(tmp, "layouts.sqlite3"))
+        stats, results = measure(
+            "pdf_templates", [pdf for pdf, _ in corpus],
+            lambda pdf: extract_dividendenrendite_from_pdf(pdf, templates=templates), repeat=max(2, args.repeat),
+        )
+        templates.close()
+    stats['mismatches'] = count_mismatches("pdf_templates", corpus, results)
+    return stats
+
+
+def bench_pdf_fields(args):
+    from handle_pdf import extract_fields_from_pdf
+
+    corpus = factsheet_corpus(args)
+    stats, results = measure("pdf_fields", [pdf for pdf, _ in corpus], extract_fields_from_pdf, repeat=args.repeat)
+    stats['mismatches'] = count_mismatches(
+        "pdf_fields", corpus, [fields['dividendenrendite'] for fields in results]
+    )
+    return stats
+
+
+def bench_db_write(args, etf_rows):
+    from write_to_db import insert_etf_entries
+
+    if not etf_rows:
+        etf_rows, _ = bench_parse_tables(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.db_url or f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}"
+        batches = [etf_rows[start:start + args.batch_size] for start in range(0, len(etf_rows), args.batch_size)]
+        # First round inserts, the following rounds update the same ISINs
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats, _ = measure("db_write", batches, lambda batch: insert_etf_entries(batch, db_url),
+                               repeat=max(2, args.repeat))
+    stats['rows_per_batch'] = args.batch_size
+    stats['rows_per_s'] = round(sum(len(batch) for batch in batches) * max(2, args.repeat) / stats['total_s'], 2)
+    return stats
+
+
+def bench_cold_start(args):
+    repo_dir = os.path.dirname(BENCH_DIR)
+    command = [sys.executable, COLD_START_SCRIPT] + (['--imports-only'] if args.imports_only else [])
+    runs = []
+    start = time.perf_counter()
+    for _ in range(args.cold_starts):
+        # Wall time from process creation to the child's report, i.e. including interpreter startup
+        run_start = time.perf_counter()
+        child = subprocess.Popen(command, cwd=repo_dir, stdout=subprocess.PIPE, text=True)
+        line = child.stdout.readline()
+        wall = time.perf_counter() - run_start
+        child.wait()
+        phases = json.loads(line) if line.strip() else {'error': f"exit code {child.returncode}"}
+        if 'error' in phases:
+            raise RuntimeError(f"cold_start: {phases['error']} (use --imports-only without Chrome)")
+        runs.append((wall, phases))
+    stats = summarize("cold_start", [wall for wall, _ in runs], time.perf_counter() - start)
+    stats['until'] = 'import' if args.imports_only else 'first_get'
+    for phase in runs[0][1]:
+        stats[f"{phase}_p50_ms"] = round(percentile(sorted(p[phase] for _, p in runs), 0.5) * 1000, 3)
+    return stats
+
+
+def run(args):
+    report = {
+        'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'stages': {},
+    }
+    etf_rows = []
+    for stage in args.stages:
+        if stage == 'parse_tables':
+            report['stages'][stage], etf_rows = bench_parse_tables(args)
+        elif stage == 'profile':
+            report['stages'][stage] = bench_profile(args)
+        elif stage == 'pdf_extract':
+            report['stages'][stage] = bench_pdf_extract(args)
+        elif stage == 'pdf_templates':
+            report['stages'][stage] = bench_pdf_templates(args)
+        elif stage == 'pdf_fields':
+            report['stages'][stage] = bench_pdf_fields(args)
+        elif stage == 'db_write':
+            report['stages'][stage] = bench_db_write(args, etf_rows)
+        elif stage == 'cold_start':
+            report['stages'][stage] = bench_cold_start(args)
+    return report
+
+
+def compare(report, baseline, threshold):
+    """
+    Compares each stage against the baseline.
+    Returns:
+        list of str: One message per regressed stage.
+    """
+    regressions = []
+    for stage, stats in report['stages'].items():
+        base = baseline.get('stages', {}).get(stage)
+        if not base:
+            continue
+        if base['p50_ms'] and stats['p50_ms'] > base['p50_ms'] * (1 + threshold):
+            regressions.append(f"{stage}: p50 {stats['p50_ms']} ms vs. baseline {base['p50_ms']} ms")
+        if base['throughput_per_s'] and stats['throughput_per_s'] < base['throughput_per_s'] / (1 + threshold):
+            regressions.append(
+                f"{stage}: throughput {stats['throughput_per_s']}/s vs. baseline {base['throughput_per_s']}/s"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for table parsing, PDF extraction and DB writes.")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--tables', type=int, default=16, help="Generated overview tables")
+    parser.add_argument('--rows', type=int, default=60, help="Rows per generated overview table")
+    parser.add_argument('--profiles', type=int, default=200, help="Generated profile pages")
+    parser.add_argument('--pdfs', type=int, default=50, help="Generated factsheets")
+    parser.add_argument('--batch-size', type=int, default=200, help="ETFs per insert_etf_entries call")
+    parser.add_argument('--repeat', type=int, default=3, help="Rounds over each stage's inputs")
+    parser.add_argument('--cold-starts', type=int, default=5, help="Fresh processes started by cold_start")
+    parser.add_argument('--imports-only', action='store_true', help="cold_start without Chrome: time to import")
+    parser.add_argument('--db-url', help="Database for db_write, e.g. a local Postgres (default: temporary SQLite)")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--require-baseline', action='store_true',
+                        help="Fail if the baseline is missing instead of skipping the comparison")
+    parser.add_argument('--output', help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    # The scraper logs every parsed table and factsheet on the root logger; keep only warnings from it
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+    log.setLevel(logging.INFO)
+
+    report = run(args)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    failed = any(stats.get('mismatches') for stats in report['stages'].values())
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        log.info(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for message in regressions:
+            log.error(f"Regression beyond {args.threshold:.0%}: {message}")
+        failed = failed or bool(regressions)
+    elif args.require_baseline:
+        log.error(f"No baseline at {args.baseline}; run with --save-baseline on the reference machine first.")
+        failed = True
+    else:
+        log.info(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+CHROMEDRIVER_CACHE_PATH = ".chromedriver.json"  # Resolved chromedriver path, reused by later runs
+CHROMEDRIVER_MAX_AGE_DAYS = 7  # Re-resolve (online version check) after this long, Chrome updates itself
+# Offline mode never contacts the network: the cached path, CHROMEDRIVER_PATH or a chromedriver on PATH is used
+OFFLINE = os.getenv("CHROMEDRIVER_OFFLINE", "") == "1"
+
+_resolved = None
+_lock = threading.Lock()
+
+
+def _read_cache(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.isfile(entry.get('path', '')):
+        return None
+    return entry
+
+
+def _write_cache(path, driver_path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'path': driver_path, 'resolved_at': time.time()}, f)
+    os.replace(tmp_path, path)
+
+
+def resolve_chromedriver_path(offline=None, cache_path=CHROMEDRIVER_CACHE_PATH, max_age_days=CHROMEDRIVER_MAX_AGE_DAYS):
+    """
+    Returns the path of the chromedriver binary without a network round trip on most runs.
+    Order: CHROMEDRIVER_PATH environment variable, the path cached by an earlier run (if younger than
+    max_age_days, or of any age in offline mode), a chromedriver on PATH (offline mode only), and finally
+    webdriver_manager, which checks the installed Chrome version online. The result is cached on disk
+    and for the rest of the process, so pooled drivers resolve it once.
+    Args:
+        offline (bool): Never contact the network. Defaults to OFFLINE (env CHROMEDRIVER_OFFLINE=1).
+        cache_path (str): File the resolved path is cached in.
+        max_age_days (float): Age after which an online run resolves the path again.
+    Returns:
+        str: Path of the chromedriver binary.
+    Raises:
+        FileNotFoundError: In offline mode, if no chromedriver can be found locally.
+    """
+    global _resolved
+    offline = OFFLINE if offline is None else offline
+    with _lock:
+        if _resolved:
+            return _resolved
+        env_path = os.getenv("CHROMEDRIVER_PATH")
+        if env_path and os.path.isfile(env_path):
+            _resolved = env_path
+            return _resolved
+        entry = _read_cache(cache_path)
+        if entry and (offline or time.time() - entry.get('resolved_at', 0) < max_age_days * 86400):
+            logging.info(f"Using cached chromedriver: {entry['path']}")
+            _resolved = entry['path']
+            return _resolved
+        if offline:
+            on_path = shutil.which("chromedriver")
+            if not on_path:
+                raise FileNotFoundError(
+                    "Offline mode: no cached chromedriver, CHROMEDRIVER_PATH or chromedriver on PATH."
+                )
+            _resolved = on_path
+            return _resolved
+        # Imported only when needed: it pulls in requests and checks versions over the network
+        from webdriver_manager.chrome import ChromeDriverManager
+        start = time.monotonic()
+        driver_path = ChromeDriverManager().install()
+        logging.info(f"Resolved chromedriver in {time.monotonic() - start:.1f}s: {driver_path}")
+        try:
+            _write_cache(cache_path, driver_path)
+        except OSError as e:
+            logging.warning(f"Could not cache chromedriver path: {e}")
+        _resolved = driver_path
+        return _resolved
+
+
+def invalidate_chromedriver_cache(cache_path=CHROMEDRIVER_CACHE_PATH):
+    """Forgets the resolved path, e.g. after Chrome updated and the cached driver no longer matches it."""
+    global _resolved
+    with _lock:
+        _resolved = None
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass
@@ -63,10 +63,11 @@ export default function InvestmentCalculator() {
         }
         facts = await response.json()
         setEtfFacts(facts)
-        if (facts.dividendenrendite) {
+        // dividendenrendite_pct is parsed from the text at ingest (in percent) and null if none was found
+        if (facts.dividendenrendite_pct != null) {
           setDivRenditeHint(`Dividendenrendite wurde aus der Datenbank übernommen. Im Jahr 2024 betrug sie: ${facts.dividendenrendite} /n
             Vorraussichtlich wird sie dieses Jahr ähnlich groß sein.`)
-          dividendenrendite = Number.parseFloat(facts.dividendenrendite.replace("%", "")) / 100
+          dividendenrendite = Number(facts.dividendenrendite_pct) / 100
         } else {
           setDivRenditeHint("Dividendenrendite konnte nicht gefunden werden.")
           throw new Error("Dividendenrendite konnte nicht gefunden werden.")
@@ -0,0 +1,336 @@
+import argparse
+import json
+import logging
+import math
+import signal
+import threading
+import time
+from datetime import datetime, timezone
+
+import chromedriver
+import metrics
+import scraper
+from driver_pool import is_driver_alive, quit_driver
+from factsheet_cache import FactsheetCache
+from factsheet_pipeline import FactsheetPipeline, DOWNLOAD_WORKERS, EXTRACT_WORKERS, QUEUE_SIZE
+from http_client import HostBudget, HOST_REQUESTS_PER_MINUTE, HOST_BURST
+
+DAEMON_OVERVIEW_INTERVAL_HOURS = 6  # Overview tables (values, new and changed ISINs) are re-read this often
+DAEMON_MIN_REFRESH_HOURS = 24  # A factsheet is not read again sooner than this, however high its priority
+DAEMON_IDLE_SECONDS = 60  # Pause when no factsheet is due, and before retrying a failed overview read
+DAEMON_RETRY_MINUTES = 15  # Retry delay after a failed factsheet read; doubles per failure, up to the min refresh
+DAEMON_VIEWS_PATH = "etf_views.json"  # Optional {ISIN: view count}; often viewed ETFs are refreshed first
+
+
+def load_view_counts(path=DAEMON_VIEWS_PATH):
+    """
+    Loads view counts per ISIN, e.g. exported from the web app's analytics.
+    Returns:
+        dict: ISIN -> number of views; empty if the file does not exist or cannot be read.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            return {isin: float(views) for isin, views in json.load(f).items()}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, AttributeError, TypeError) as e:
+        logging.warning(f"Could not read view counts from {path}: {e}")
+        return {}
+
+
+def _epoch(value):
+    """Returns a stored timestamp as epoch seconds (naive values are UTC), or None."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class FreshnessScheduler:
+    """
+    Decides which ETF's factsheet the daemon reads next.
+    New ISINs, ETFs whose FACTSHEET_RELEVANT_FIELDS changed and ETFs without stored Dividendenrendite come
+    first. All others are ordered by their staleness (seconds since the last factsheet read) weighted by
+    popularity, 1 + ln(1 + views), and are only due once their last read is min_refresh_hours old.
+    An ETF handed out by next_due is not due again until mark_read or mark_failed reports its outcome; after
+    a failure it is retried with exponential backoff. mark_read and mark_failed may be called from other
+    threads.
+    """
+
+    def __init__(self, min_refresh_hours=DAEMON_MIN_REFRESH_HOURS, views=None, retry_minutes=DAEMON_RETRY_MINUTES):
+        self.min_refresh_seconds = min_refresh_hours * 3600
+        self.retry_seconds = retry_minutes * 60
+        self.views = views or {}
+        self._lock = threading.Lock()
+        # ISIN -> [ETF dict, last factsheet read in epoch seconds or None, not due before (epoch seconds),
+        #          failures since the last read]
+        self._items = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def update(self, etf_rows, freshness, now=None):
+        """
+        Replaces the scheduled ETFs with the rows of a new overview read. Rows get their stored
+        Dividendenrendite copied over, so writing them does not clear it.
+        Args:
+            etf_rows (list of dict): ETF rows from the overview tables, deduplicated by ISIN.
+            freshness (dict): ISIN -> stored row, as returned by load_freshness.
+        """
+        now = now or time.time()
+        with self._lock:
+            items = {}
+            for etf in etf_rows:
+                isin = etf.get('isin')
+                if not isin:
+                    continue
+                stored = freshness.get(isin)
+                known = self._items.get(isin) or [None, None, 0.0, 0]
+                if stored is None or any(
+                    etf.get(field, '') != (stored.get(field) or '') for field in scraper.FACTSHEET_RELEVANT_FIELDS
+                ):
+                    checked = None
+                elif not stored.get('dividendenrendite') and not (
+                    known[1] and now - known[1] < self.min_refresh_seconds
+                ):
+                    # Nothing stored, and not read by this daemon recently: due like a new ISIN
+                    checked = None
+                else:
+                    # A read of this daemon may not have reached the database yet
+                    checked = max(filter(None, (_epoch(stored.get('factsheet_checked_at')), known[1])), default=None)
+                if stored:
+                    etf['dividendenrendite'] = stored.get('dividendenrendite') or ''
+                items[isin] = [etf, checked, known[2], known[3]]
+            self._items = items
+
+    def next_due(self, now=None):
+        """
+        Returns the ETF with the highest priority that is due, or None. The ETF is not due again until its
+        outcome is reported (or min_refresh_hours passed).
+        """
+        now = now or time.time()
+        with self._lock:
+            best, best_key = None, None
+            for isin, (etf, checked, not_before, _) in self._items.items():
+                if now < not_before:
+                    continue
+                weight = 1 + math.log1p(self.views.get(isin, 0))
+                if checked is None:
+                    key = (1, weight)
+                elif now - checked >= self.min_refresh_seconds:
+                    key = (0, (now - checked) * weight)
+                else:
+                    continue
+                if best_key is None or key > best_key:
+                    best, best_key = isin, key
+            if best is None:
+                return None
+            self._items[best][2] = now + self.min_refresh_seconds
+            return self._items[best][0]
+
+    def mark_read(self, isin, now=None):
+        """Records that the factsheet of isin was read; it is due again after min_refresh_hours."""
+        now = now or time.time()
+        with self._lock:
+            item = self._items.get(isin)
+            if item:
+                item[1:] = [now, 0.0, 0]
+
+    def mark_failed(self, isin, now=None):
+        """Records that the factsheet of isin could not be read; it is retried after a backoff."""
+        now = now or time.time()
+        with self._lock:
+            item = self._items.get(isin)
+            if item:
+                item[3] += 1
+                item[2] = now + min(self.retry_seconds * 2 ** (item[3] - 1), self.min_refresh_seconds)
+
+
+class ScraperDaemon:
+    """
+    Long-running scraper. One warm headless driver, the factsheet pipeline (download threads, extractor
+    processes, factsheet cache) and the database engine and writer are set up once and reused for the
+    whole lifetime. Every overview_interval_hours the overview tables are re-read, the scheduler updated and
+    the factsheet cache evicted; in between, the FreshnessScheduler picks one factsheet at a time. Every
+    request to a host goes through the HostBudget (the scraper's own requests via scraper.REQUEST_BUDGET),
+    so the site sees a steady, bounded request rate.
+    The timing report is written and the metrics restarted on every overview read.
+
+    Usage:
+        daemon = ScraperDaemon(supabase_url())
+        daemon.run()  # until daemon.stop() is called, e.g. from a SIGTERM handler
+    """
+
+    def __init__(self, db_url, budget=None, scheduler=None, overview_interval_hours=DAEMON_OVERVIEW_INTERVAL_HOURS,
+                 idle_seconds=DAEMON_IDLE_SECONDS, report_path=metrics.REPORT_PATH, prometheus_path=None):
+        self.db_url = db_url
+        self.budget = budget or HostBudget()
+        self.scheduler = scheduler or FreshnessScheduler()
+        self.overview_interval_seconds = overview_interval_hours * 3600
+        self.idle_seconds = idle_seconds
+        self.report_path = report_path
+        self.prometheus_path = prometheus_path
+        self.driver = None
+        self._cookies_accepted = False
+        self._next_overview = 0.0
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Asks the daemon to finish: the current item completes, queued factsheets are written."""
+        self._stop.set()
+
+    def _ensure_driver(self):
+        if self.driver is not None and is_driver_alive(self.driver):
+            return True
+        quit_driver(self.driver)
+        self.driver = scraper.setup_driver(headless=True)
+        self._cookies_accepted = False
+        return self.driver is not None
+
+    def _rotate_metrics(self):
+        metrics.RUN.log_summary()
+        metrics.RUN.write_report(self.report_path)
+        if self.prometheus_path:
+            metrics.RUN.write_prometheus(self.prometheus_path)
+        metrics.RUN = metrics.RunMetrics()
+
+    def refresh_overview(self, writer):
+        """
+        Re-reads the overview tables on the warm driver, writes their values and updates the scheduler.
+        Returns:
+            bool: True if at least one table was read.
+        """
+        from write_to_db import load_freshness
+
+        if not self._ensure_driver() or not self.budget.acquire(scraper.URL, self._stop):
+            return False
+        if not scraper.open_overview(self.driver, accept_cookie_banner=not self._cookies_accepted):
+            return False
+        self._cookies_accepted = True
+        etf_rows = []
+        tables = 0
+        for anchor in scraper.collect_aktien_anchors(self.driver):
+            if tables >= scraper.MAX_TABLES or not self.budget.acquire(scraper.URL, self._stop):
+                break
+            table_rows = scraper.load_table_for_anchor(self.driver, *anchor)
+            if table_rows:
+                etf_rows.extend(table_rows)
+                tables += 1
+        if not etf_rows:
+            return False
+        etf_rows = scraper.dedupe_by_isin(etf_rows)
+        self.scheduler.update(etf_rows, load_freshness(self.db_url))
+        for etf in etf_rows:
+            # A copy: the scheduled dict receives factsheet results while the batch may still be waiting
+            writer.put(dict(etf))
+        logging.info(f"Daemon: {len(etf_rows)} ETFs from {tables} tables scheduled.")
+        return True
+
+    def refresh_factsheet(self, etf, writer, pipeline):
+        """
+        Finds the factsheet of one scheduled ETF and queues it for download and extraction. If no factsheet
+        can be found, nothing is written: the stored Dividendenrendite is kept and the scheduler retries later.
+        """
+        isin = etf.get('isin')
+        submitted = False
+        try:
+            profile_url = etf.get('profile_url')
+            if not profile_url or not self._ensure_driver():
+                return
+            with metrics.span('profile_load', isin=isin) as span:
+                factsheet_url = scraper.find_factsheet_url(self.driver, profile_url)
+                span['found'] = bool(factsheet_url)
+            if not factsheet_url:
+                logging.info(f"Daemon: no factsheet link found for {isin}; keeping the stored value.")
+            elif self.budget.acquire(factsheet_url, self._stop):
+                pipeline.submit(etf, factsheet_url)
+                submitted = True
+        finally:
+            if not submitted:
+                self.scheduler.mark_failed(isin)
+
+    def factsheet_done(self, etf, ok, writer):
+        """Pipeline callback: writes the ETF if its factsheet was read, else leaves the stored row alone."""
+        if not ok:
+            self.scheduler.mark_failed(etf.get('isin'))
+            return
+        etf['factsheet_checked_at'] = datetime.now(timezone.utc)
+        # A copy: the scheduled dict may be read again while the batch is still waiting
+        writer.put(dict(etf))
+        self.scheduler.mark_read(etf.get('isin'))
+
+    def run(self):
+        """Runs until stop() is called."""
+        from write_to_db import BatchWriter
+
+        cache = FactsheetCache() if scraper.USE_FACTSHEET_CACHE else None
+        # Profile pages (HTTP and browser fallback) and data URL probes each take their own token
+        scraper.REQUEST_BUDGET = self.budget
+        try:
+            with BatchWriter(self.db_url) as writer, \
+                    FactsheetPipeline(download_workers=DOWNLOAD_WORKERS, extract_workers=EXTRACT_WORKERS,
+                                      queue_size=QUEUE_SIZE, cache=cache,
+                                      on_result=lambda etf, ok: self.factsheet_done(etf, ok, writer)) as pipeline:
+                while not self._stop.is_set():
+                    try:
+                        if time.monotonic() >= self._next_overview:
+                            if self._next_overview:
+                                self._rotate_metrics()
+                            ok = self.refresh_overview(writer)
+                            self._next_overview = time.monotonic() + (
+                                self.overview_interval_seconds if ok else self.idle_seconds
+                            )
+                            if cache:
+                                cache.evict()
+                            continue
+                        etf = self.scheduler.next_due()
+                        if etf is None:
+                            self._stop.wait(self.idle_seconds)
+                            continue
+                        self.refresh_factsheet(etf, writer, pipeline)
+                    except Exception as e:
+                        # Keep running; a broken driver is replaced on the next item
+                        logging.error(f"Daemon: {type(e).__name__}: {e}")
+        finally:
+            scraper.REQUEST_BUDGET = None
+            if cache:
+                cache.close()
+            quit_driver(self.driver)
+            self.driver = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Keep the ETF database fresh: a long-running scraper with warm browser and request budget."
+    )
+    parser.add_argument('--requests-per-minute', type=float, default=HOST_REQUESTS_PER_MINUTE,
+                        help="request budget per host")
+    parser.add_argument('--views', default=DAEMON_VIEWS_PATH,
+                        help="JSON file of view counts per ISIN; often viewed ETFs are refreshed first")
+    parser.add_argument('--offline-driver', action='store_true', default=chromedriver.OFFLINE,
+                        help="never resolve chromedriver online; use the cached path, CHROMEDRIVER_PATH or PATH")
+    parser.add_argument('--report', default=metrics.REPORT_PATH,
+                        help="write the timing summary of every overview cycle as JSON to this file")
+    parser.add_argument('--prometheus',
+                        help="also write the summary in Prometheus text format to this file (textfile collector)")
+    args = parser.parse_args()
+    chromedriver.OFFLINE = args.offline_driver
+    log_listener = metrics.setup_logging()
+    from write_to_db import supabase_url
+
+    daemon = ScraperDaemon(
+        supabase_url(), budget=HostBudget(args.requests_per_minute, HOST_BURST),
+        scheduler=FreshnessScheduler(views=load_view_counts(args.views)),
+        report_path=args.report, prometheus_path=args.prometheus,
+    )
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: daemon.stop())
+    try:
+        daemon.run()
+    finally:
+        metrics.RUN.log_summary()
+        metrics.RUN.write_report(args.report)
+        if args.prometheus:
+            metrics.RUN.write_prometheus(args.prometheus)
+        log_listener.stop()
@@ -0,0 +1,163 @@
+import logging
+import os
+import queue
+import threading
+
+BROWSER_POOL_SIZE = 3  # Headless drivers working through the overview tables in parallel
+MAX_ITEM_ATTEMPTS = 3  # A work item is retried on a fresh driver this many times before it is given up
+
+
+def is_driver_alive(driver):
+    """
+    Cheap liveness probe for a WebDriver session.
+    Returns:
+        bool: False if the browser or chromedriver is gone (crashed, window closed, session invalid).
+    """
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+
+def browser_rss_bytes(driver):
+    """
+    Returns the resident memory of the browser behind a driver: the summed RSS of all processes started
+    by its chromedriver (Chrome, renderers, GPU and utility processes). Shared pages are counted per process.
+    Returns:
+        int or None: Bytes, or None where /proc is not available (not Linux) or the driver has no local service.
+    """
+    try:
+        root_pid = driver.service.process.pid
+    except AttributeError:
+        return None
+    if not os.path.isdir(f"/proc/{root_pid}"):
+        return None
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    pids = [root_pid]
+    while pids:
+        pid = pids.pop()
+        try:
+            for task in os.listdir(f"/proc/{pid}/task"):
+                with open(f"/proc/{pid}/task/{task}/children") as f:
+                    pids.extend(int(child) for child in f.read().split())
+            if pid != root_pid:
+                with open(f"/proc/{pid}/statm") as f:
+                    total += int(f.read().split()[1]) * page_size
+        except OSError:
+            continue  # The process exited while we walked the tree
+    return total
+
+
+def quit_driver(driver):
+    """Quits a driver, ignoring errors from sessions that are already dead."""
+    if driver is None:
+        return
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class DriverPool:
+    """
+    A fixed-size pool of WebDriver workers that share one queue of work items.
+    Every worker owns its driver for the whole run: it creates it, warms it up (e.g. loads the
+    overview page and accepts the cookie banner) and replaces it whenever it crashes.
+    Items that failed on a dead driver are put back on the queue and retried on a fresh one.
+    """
+
+    def __init__(self, size, create_driver, warm_up=None, max_attempts=MAX_ITEM_ATTEMPTS):
+        """
+        Args:
+            size (int): Number of drivers / worker threads.
+            create_driver (callable): Returns a new WebDriver instance, or None on failure.
+            warm_up (callable): Called with a fresh driver before it takes work; returns False if warm-up failed.
+            max_attempts (int): Attempts per work item before giving up on it.
+        """
+        self.size = max(1, size)
+        self.create_driver = create_driver
+        self.warm_up = warm_up
+        self.max_attempts = max_attempts
+
+    def run(self, work_items, handle_item, should_stop=None):
+        """
+        Processes all work items on the pool and returns their results.
+        Args:
+            work_items (list): Items to hand out to the drivers.
+            handle_item (callable): handle_item(driver, item) -> result. Exceptions mark the attempt as failed.
+            should_stop (callable): Optional; checked before each item, stops all workers once it returns True.
+        Returns:
+            list of (item, result): Results of successfully processed items, in completion order.
+        """
+        work_queue = queue.Queue()
+        for item in work_items:
+            work_queue.put((item, 1))
+        results = []
+        results_lock = threading.Lock()
+
+        workers = [
+            threading.Thread(
+                target=self._worker, args=(n, work_queue, handle_item, should_stop, results, results_lock),
+                name=f"driver-pool-{n}", daemon=True,
+            )
+            for n in range(min(self.size, len(work_items)))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return results
+
+    def _new_driver(self, worker_id):
+        for attempt in range(1, self.max_attempts + 1):
+            driver = self.create_driver()
+            if driver is None:
+                logging.warning(f"Driver pool worker {worker_id}: driver setup failed (attempt {attempt}).")
+                continue
+            if self.warm_up is None or self.warm_up(driver) is not False:
+                return driver
+            logging.warning(f"Driver pool worker {worker_id}: warm-up failed (attempt {attempt}).")
+            quit_driver(driver)
+        return None
+
+    def _worker(self, worker_id, work_queue, handle_item, should_stop, results, results_lock):
+        driver = self._new_driver(worker_id)
+        if driver is None:
+            logging.error(f"Driver pool worker {worker_id}: could not start a driver; worker exits.")
+            return
+        try:
+            while True:
+                if should_stop and should_stop():
+                    break
+                try:
+                    item, attempt = work_queue.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    result = handle_item(driver, item)
+                    error = None
+                except Exception as e:
+                    result = None
+                    error = e
+                # An empty result from a dead driver is a crash, not an empty table
+                if result or is_driver_alive(driver):
+                    if error is None:
+                        with results_lock:
+                            results.append((item, result))
+                    else:
+                        logging.warning(f"Driver pool worker {worker_id}: item {item} failed: {error}")
+                    continue
+                logging.warning(f"Driver pool worker {worker_id}: driver crashed on {item}; recycling it.")
+                quit_driver(driver)
+                if attempt < self.max_attempts:
+                    work_queue.put((item, attempt + 1))
+                else:
+                    logging.error(f"Driver pool worker {worker_id}: giving up on {item} after {attempt} attempts.")
+                driver = self._new_driver(worker_id)
+                if driver is None:
+                    logging.error(f"Driver pool worker {worker_id}: could not restart its driver; worker exits.")
+                    return
+        finally:
+            quit_driver(driver)
@@ -0,0 +1,88 @@
+import re
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+# Texts that mean "no value" in the scraped columns (lower case), including handle_pdf.NO_DIVIDENDENRENDITE.
+# Not imported from handle_pdf to keep pdfplumber out of the database code.
+SENTINELS = {'', '-', '--', '–', 'n/a', 'k.a.', 'k. a.', 'no divrendite found'}
+
+_NUMBER_RE = re.compile(r"[-+−]?\d[\d.,]*")
+_THOUSANDS_RE = re.compile(r"[-+]?\d{1,3}(?:\.\d{3})+")
+_DATE_RE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})")
+# Fund size units relative to millions
+_SIZE_UNITS = (("mrd", Decimal(1000)), ("bn", Decimal(1000)), ("mio", Decimal(1)), ("tsd", Decimal("0.001")))
+
+
+def _is_sentinel(text):
+    return text is None or text.strip().lower() in SENTINELS
+
+
+def parse_german_number(text, dot_is_thousands=True):
+    """
+    Parses the first number in a German formatted text ("1.234,56", "-3,2", "4.217").
+    Args:
+        text (str): The raw text.
+        dot_is_thousands (bool): Read a lone '.' as thousands separator ("4.217" -> 4217) if it is followed
+            by groups of three digits. With False it is always read as decimal point ("4.06" -> 4.06).
+    Returns:
+        Decimal or None: The number, or None for sentinels and texts without a number.
+    """
+    if _is_sentinel(text):
+        return None
+    match = _NUMBER_RE.search(text)
+    if not match:
+        return None
+    number = match.group(0).replace('−', '-').rstrip('.,')
+    if ',' in number:
+        number = number.replace('.', '').replace(',', '.')
+    elif dot_is_thousands and _THOUSANDS_RE.fullmatch(number):
+        number = number.replace('.', '')
+    try:
+        return Decimal(number)
+    except InvalidOperation:
+        return None
+
+
+def parse_percent(text):
+    """
+    Parses a percentage as its number of percent ("2,02%" -> 2.02, "0,2 %" -> 0.2).
+    Factsheets in English notation ("4.06%") are read correctly as well.
+    Returns:
+        Decimal or None: The value in percent, or None for sentinels such as 'no DivRendite found'.
+    """
+    return parse_german_number(text, dot_is_thousands=False)
+
+
+def parse_fund_size(text):
+    """
+    Parses a fund size in millions ("4.217" -> 4217, "1.234 Mio. €" -> 1234, "1,2 Mrd. €" -> 1200).
+    The overview table lists fund sizes in EUR millions without unit.
+    Returns:
+        Decimal or None: The fund size in millions.
+    """
+    value = parse_german_number(text)
+    if value is None:
+        return None
+    lowered = text.lower()
+    for unit, factor in _SIZE_UNITS:
+        if unit in lowered:
+            return value * factor
+    return value
+
+
+def parse_german_date(text):
+    """
+    Parses a German date ("03.09.2012").
+    Returns:
+        datetime.date or None: The date, or None for sentinels and invalid dates.
+    """
+    if _is_sentinel(text):
+        return None
+    match = _DATE_RE.search(text)
+    if not match:
+        return None
+    day, month, year = (int(part) for part in match.groups())
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
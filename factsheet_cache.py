@@ -0,0 +1,173 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+import metrics
+from http_client import get_http_session, HTTP_TIMEOUT
+
+FACTSHEET_CACHE_DIR = ".factsheet_cache"
+CACHE_MAX_BYTES = 500 * 1024 * 1024  # Evict least recently used PDFs beyond this total size
+CACHE_MAX_AGE_DAYS = 90  # Evict entries that were not requested for this long
+CACHE_EVICT_GRACE_SECONDS = 600  # PDFs written more recently are never deleted: a download may still index them
+
+CachedFactsheet = namedtuple('CachedFactsheet', ['path', 'sha256', 'result'])
+
+
+class FactsheetCache:
+    """
+    On-disk cache of factsheet PDFs keyed by factsheet URL.
+    For every URL it keeps the validators (ETag/Last-Modified), the SHA-256 of the content and the
+    extracted Dividendenrendite. Requests are sent conditionally; a 304, or a 200 whose content hash is
+    unchanged, returns the stored result so neither download nor parse has to be repeated.
+    PDFs are stored once per content hash under <cache_dir>/pdf/, the index lives in <cache_dir>/index.sqlite3.
+    Safe to share between the download threads of one process.
+    """
+
+    def __init__(self, cache_dir=FACTSHEET_CACHE_DIR, max_bytes=CACHE_MAX_BYTES, max_age_days=CACHE_MAX_AGE_DAYS):
+        self.cache_dir = cache_dir
+        self.pdf_dir = os.path.join(cache_dir, 'pdf')
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 24 * 3600
+        os.makedirs(self.pdf_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite3'), check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS factsheets (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                result TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    def _pdf_path(self, sha256):
+        return os.path.join(self.pdf_dir, f"{sha256}.pdf")
+
+    def _lookup(self, url):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, sha256, result FROM factsheets WHERE url = ?", (url,)
+            ).fetchone()
+        if row and os.path.exists(self._pdf_path(row[2])):
+            return row
+        return None
+
+    def fetch(self, url):
+        """
+        Returns the factsheet behind url, revalidating a cached copy instead of downloading it again.
+        Args:
+            url (str): The factsheet URL.
+        Returns:
+            CachedFactsheet or None: path to the cached PDF, its SHA-256 and the stored extraction result
+            (None if the PDF is new or changed and still needs to be parsed). None if the download failed.
+        """
+        entry = self._lookup(url)
+        headers = {}
+        if entry:
+            etag, last_modified, _, _ = entry
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        with metrics.span('pdf_download', url=url, conditional=bool(headers)) as span:
+            try:
+                response = get_http_session().get(url, headers=headers, timeout=HTTP_TIMEOUT)
+                span['status'] = response.status_code
+                if response.status_code == 304 and entry:
+                    sha256, result = entry[2], entry[3]
+                    with self._lock:
+                        self._db.execute("UPDATE factsheets SET accessed_at = ? WHERE url = ?", (time.time(), url))
+                        self._db.commit()
+                    logging.info(f"Factsheet not modified, using cached copy: {url}")
+                    return CachedFactsheet(self._pdf_path(sha256), sha256, result)
+                response.raise_for_status()
+                content = response.content
+                span['bytes'] = len(content)
+            except Exception as e:
+                span['ok'] = False
+                logging.error(f"Failed to download PDF from {url}: {e}")
+                return None
+
+        sha256 = hashlib.sha256(content).hexdigest()
+        path = self._pdf_path(sha256)
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        # Same bytes as last time: the stored result is still valid
+        result = entry[3] if entry and entry[2] == sha256 else None
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT INTO factsheets (url, etag, last_modified, sha256, size, result, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag, last_modified = excluded.last_modified, sha256 = excluded.sha256,
+                    size = excluded.size, result = excluded.result,
+                    fetched_at = excluded.fetched_at, accessed_at = excluded.accessed_at
+                """,
+                (url, response.headers.get('ETag'), response.headers.get('Last-Modified'), sha256,
+                 len(content), result, now, now),
+            )
+            self._db.commit()
+        return CachedFactsheet(path, sha256, result)
+
+    def store_result(self, url, sha256, result):
+        """
+        Stores the extraction result for a factsheet, unless its content changed in the meantime.
+        Args:
+            url (str): The factsheet URL.
+            sha256 (str): Hash of the PDF the result was extracted from.
+            result (str): The extracted value.
+        """
+        with self._lock:
+            self._db.execute("UPDATE factsheets SET result = ? WHERE url = ? AND sha256 = ?", (result, url, sha256))
+            self._db.commit()
+
+    def evict(self):
+        """
+        Drops entries not requested within max_age_days, then the least recently used ones until the
+        stored PDFs fit into max_bytes. PDF files no longer referenced by any entry are deleted, unless they
+        were written in the last CACHE_EVICT_GRACE_SECONDS, so evict() can run while downloads are in flight.
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM factsheets WHERE accessed_at < ?", (time.time() - self.max_age_seconds,))
+            total = 0
+            for sha256, size in self._db.execute(
+                "SELECT sha256, MAX(size) FROM factsheets GROUP BY sha256 ORDER BY MAX(accessed_at) DESC"
+            ).fetchall():
+                total += size
+                if total > self.max_bytes:
+                    self._db.execute("DELETE FROM factsheets WHERE sha256 = ?", (sha256,))
+            self._db.commit()
+            referenced = {row[0] for row in self._db.execute("SELECT DISTINCT sha256 FROM factsheets")}
+        removed = 0
+        written_before = time.time() - CACHE_EVICT_GRACE_SECONDS
+        for name in os.listdir(self.pdf_dir):
+            if name.endswith('.pdf') and name[:-4] not in referenced:
+                path = os.path.join(self.pdf_dir, name)
+                try:
+                    if os.path.getmtime(path) < written_before:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        if removed:
+            logging.info(f"Factsheet cache: evicted {removed} PDFs.")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
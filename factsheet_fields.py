@@ -0,0 +1,180 @@
+import re
+from collections import namedtuple
+
+NO_DIVIDENDENRENDITE = 'no DivRendite found'
+# Keywords in priority order; a match of an earlier keyword always wins over a later one.
+KEYWORD_PRIORITY = ["Dividendenrendite", "Dividende", "Rendite"]
+PERCENT_PATTERN = r"([\d]{1,3}[\.,][\d]{1,3}\s*%|[\d]{1,3}\s*%)"
+
+FieldSpec = namedtuple('FieldSpec', [
+    'name',  # Key in the result dict
+    'keywords',  # Regexes in priority order; the first keyword that gets a value wins
+    'value_pattern',  # Regex with one group: the value
+    'next_line',  # A keyword line without value takes the first value on the next line
+    'fallback',  # After the scan, search the whole text for "<keyword>[\s:]*<value>" in keyword order
+    'default',  # Result if nothing was found
+    'collect',  # > 0: list field, the values of up to this many lines following a keyword line
+    'flags',  # Regex flags for keywords and value
+], defaults=(True, True, None, 0, re.IGNORECASE))
+
+# Registry of the fields production reads from a factsheet, by name. Register a spec here together with the
+# column that stores it; other specs can be passed to FieldScanner directly.
+FIELD_SPECS = {}
+
+
+def register_field(spec):
+    """Adds a field spec to FIELD_SPECS (replacing one of the same name) and returns it."""
+    FIELD_SPECS[spec.name] = spec
+    return spec
+
+
+register_field(FieldSpec(
+    'dividendenrendite', KEYWORD_PRIORITY, PERCENT_PATTERN, default=NO_DIVIDENDENRENDITE,
+))
+
+_COLLECT_HEADER_LINES = 3  # Lines without value tolerated between a list keyword and its first value
+
+
+class _FieldState:
+    """Scan state of one field: the first value per keyword priority and the next-line rule."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.keyword_res = [re.compile(keyword, spec.flags) for keyword in spec.keywords]
+        self.value_re = re.compile(spec.value_pattern, spec.flags | (re.MULTILINE if spec.collect else 0))
+        self.matches = [None] * len(spec.keywords)
+        self.pending = []  # keyword priorities of the previous line still waiting for a value on this line
+        self.collected = None  # list field: values so far, None until a keyword line was seen
+        self.header_lines = 0
+        self.done = False
+
+    def first_value(self, line):
+        for match in self.value_re.finditer(line):
+            value = match.group(1).strip()
+            if value:
+                return value
+        return None
+
+    def scan_line(self, line):
+        """
+        Applies the same-line / next-line rules to one line, filling matches in document order.
+        Returns True once the top-priority keyword has a value.
+        """
+        hits = [index for index, keyword_re in enumerate(self.keyword_res) if keyword_re.search(line)]
+        if not hits and not self.pending:
+            return False
+        value = self.first_value(line)
+        if value:
+            for index in self.pending:
+                if self.matches[index] is None:
+                    self.matches[index] = value
+        self.pending.clear()
+        for index in hits:
+            if self.matches[index] is None:
+                if value:
+                    self.matches[index] = value
+                elif self.spec.next_line:
+                    self.pending.append(index)
+        self.done = self.matches[0] is not None
+        return self.done
+
+    def collect_line(self, line):
+        """List fields: collects the values of the lines following a keyword line. Returns True when done."""
+        if self.collected is None:
+            if any(keyword_re.search(line) for keyword_re in self.keyword_res):
+                self.collected, self.header_lines = [], 0
+            return False
+        value = self.first_value(line)
+        if value:
+            self.collected.append(value)
+            self.done = len(self.collected) >= self.spec.collect
+        elif self.collected:
+            self.done = True  # The list ended
+        else:
+            self.header_lines += 1
+            if self.header_lines > _COLLECT_HEADER_LINES:
+                self.collected = None  # Not the list we are looking for; wait for the next keyword
+        return self.done
+
+    def result(self, full_text):
+        if self.spec.collect:
+            return list(self.collected or self.spec.default)
+        for index, keyword in enumerate(self.spec.keywords):
+            if self.matches[index] is not None:
+                return self.matches[index]
+            if self.spec.fallback:
+                # Fallback: search the whole text for keyword followed by the value
+                match = re.search(keyword + r"[\s:]*" + self.spec.value_pattern, full_text(), self.spec.flags)
+                if match:
+                    value = match.group(1).strip()
+                    if value:
+                        return value
+        return self.spec.default
+
+
+class FieldScanner:
+    """
+    Reads several fields from the text lines of one document in a single pass.
+    Lines are fed in document order; a line that contains no keyword of any field and that no field
+    waits on is rejected with one combined regex search. Scanning can stop as soon as every field has
+    a value for its top-priority keyword (or its list is complete).
+
+    Usage:
+        scanner = FieldScanner(['dividendenrendite'])
+        for line in lines:
+            if scanner.feed(line):
+                break
+        results = scanner.results(lambda: full_text)
+    """
+
+    def __init__(self, fields=None):
+        """
+        Args:
+            fields (list of str or FieldSpec): Field names from FIELD_SPECS or specs. Defaults to all registered fields.
+        """
+        specs = [FIELD_SPECS[field] if isinstance(field, str) else field for field in (fields or FIELD_SPECS)]
+        self._states = [_FieldState(spec) for spec in specs]
+        # Each keyword keeps its own spec's case sensitivity inside the combined pre-filter
+        self._any_keyword_re = re.compile("|".join(
+            f"(?i:{keyword})" if spec.flags & re.IGNORECASE else f"(?:{keyword})"
+            for spec in specs for keyword in spec.keywords
+        ))
+        self._active = list(self._states)
+        self._waiting = False  # some field has a pending next-line keyword or an open list
+
+    def feed(self, line):
+        """
+        Scans one line.
+        Returns:
+            bool: True once every field is done, i.e. the rest of the document can be skipped.
+        """
+        if not self._waiting and not self._any_keyword_re.search(line):
+            return False
+        waiting = False
+        for state in self._active:
+            if state.spec.collect:
+                state.collect_line(line)
+                waiting = waiting or (state.collected is not None and not state.done)
+            else:
+                state.scan_line(line)
+                waiting = waiting or bool(state.pending)
+        self._waiting = waiting
+        if any(state.done for state in self._active):
+            self._active = [state for state in self._active if not state.done]
+        return not self._active
+
+    def results(self, full_text):
+        """
+        Args:
+            full_text (callable): Returns the whole document text; only called if a fallback search is needed.
+        Returns:
+            dict: Field name -> value (str, or list for list fields), the field's default if not found.
+        """
+        cache = []
+
+        def text_once():
+            if not cache:
+                cache.append(full_text())
+            return cache[0]
+
+        return {state.spec.name: state.result(text_once) for state in self._states}
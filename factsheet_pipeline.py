@@ -0,0 +1,236 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import metrics
+from handle_pdf import fetch_pdf_bytes, extract_dividendenrendite_from_pdf
+from layout_templates import get_layout_templates, issuer_from_name
+from scrape_archive import FACTSHEET
+
+DOWNLOAD_WORKERS = 8  # Concurrent factsheet downloads (network bound)
+EXTRACT_WORKERS = os.cpu_count() or 2  # Concurrent pdfplumber parses (CPU bound)
+QUEUE_SIZE = 32  # Max factsheets waiting in front of each stage
+# Read known issuer layouts only in the region where the yield was last found. Off: on the benchmark corpus
+# (yield mostly on page 1) the fingerprint and region read cost more than the early-stopping full scan
+USE_LAYOUT_TEMPLATES = False
+
+_STOP = object()
+
+
+def timed_extract(pdf_source, issuer=None):
+    """Runs in an extractor process: extracts the Dividendenrendite and measures the parse time there."""
+    start = time.monotonic()
+    templates = get_layout_templates() if USE_LAYOUT_TEMPLATES else None
+    result = extract_dividendenrendite_from_pdf(pdf_source, issuer=issuer, templates=templates)
+    return result, time.monotonic() - start
+
+
+class FactsheetPipeline:
+    """
+    Staged factsheet pipeline: link discovery -> thread pool of downloaders -> process pool of extractors.
+    Both hand-offs are bounded, so a slow stage applies backpressure to the one in front of it instead of
+    piling up PDFs in memory. Without cache the PDFs are passed to the extractors as bytes, no temp files. Results are written into the submitted ETF dict under 'dividendenrendite'.
+    With a FactsheetCache, unchanged factsheets are answered from the cache without download or parse.
+    With a ScrapeArchive every factsheet is recorded into it, or, for an archive opened for replay, read
+    from it instead of being downloaded.
+    If an extractor process dies, the process pool is replaced; the factsheets it was parsing fail, later
+    ones go to the new pool.
+    on_result(etf, ok) is called (from a pipeline thread) once an ETF's result is set. ok is False if the
+    factsheet could not be read (download or extraction failed); the ETF dict then keeps a Dividendenrendite
+    it already has.
+
+    Usage:
+        with FactsheetPipeline() as pipeline:
+            for etf, url in discovered:
+                pipeline.submit(etf, url)
+        # leaving the block waits until every submitted factsheet is done
+    """
+
+    def __init__(self, download_workers=DOWNLOAD_WORKERS, extract_workers=EXTRACT_WORKERS, queue_size=QUEUE_SIZE,
+                 cache=None, on_result=None, archive=None):
+        self.cache = cache
+        self.archive = archive
+        self.on_result = on_result
+        self.download_workers = max(1, download_workers)
+        self.extract_workers = max(1, extract_workers)
+        self._download_queue = queue.Queue(maxsize=queue_size)
+        # Caps PDFs that are downloaded but not yet parsed (running + waiting in the process pool)
+        self._extract_slots = threading.BoundedSemaphore(self.extract_workers + queue_size)
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _new_executor(self):
+        log_queue = metrics.log_queue()
+        if log_queue is not None:
+            # Extractor processes log through the parent's queue listener
+            return ProcessPoolExecutor(max_workers=self.extract_workers,
+                                       initializer=metrics.init_worker_logging, initargs=(log_queue,))
+        return ProcessPoolExecutor(max_workers=self.extract_workers)
+
+    def _replace_broken_executor(self, broken):
+        """Replaces the process pool if it still is broken (another thread may have replaced it already)."""
+        with self._executor_lock:
+            if self._executor is broken:
+                logging.error("Factsheet pipeline: an extractor process died; starting a new process pool.")
+                broken.shutdown(wait=False)
+                self._executor = self._new_executor()
+
+    def start(self):
+        self._executor = self._new_executor()
+        for n in range(self.download_workers):
+            thread = threading.Thread(target=self._download_loop, name=f"factsheet-download-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logging.info(
+            f"Factsheet pipeline started: {self.download_workers} downloaders, {self.extract_workers} extractors."
+        )
+
+    def submit(self, etf, factsheet_url):
+        """
+        Queues one factsheet for download and extraction. Blocks while the download queue is full.
+        Args:
+            etf (dict): ETF data dict; receives the 'dividendenrendite' result.
+            factsheet_url (str): Absolute URL of the factsheet PDF.
+        """
+        self._download_queue.put((etf, factsheet_url))
+
+    def close(self):
+        """
+        Stops accepting work, waits for all downloads and extractions to finish and shuts the pools down.
+        """
+        for _ in self._threads:
+            self._download_queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            # Exceptions are handled in the done-callback; this only waits for completion
+            future.exception()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.cache:
+            self.cache.evict()
+
+    def _download_loop(self):
+        while True:
+            item = self._download_queue.get()
+            if item is _STOP:
+                break
+            etf, factsheet_url = item
+            try:
+                self._process(etf, factsheet_url)
+            except Exception as e:
+                # Every submitted ETF must get exactly one result, or consumers waiting for it would hang
+                logging.error(f"ETF '{etf['name']}': factsheet processing failed: {e}")
+                self._set_result(etf, '', ok=False)
+
+    def _process(self, etf, factsheet_url):
+        """Downloads (or revalidates) one factsheet and hands it to the extractors."""
+        if self.archive and self.archive.replay:
+            cached = None
+            pdf_source = self.archive.get(FACTSHEET, factsheet_url)
+        elif self.cache:
+            cached = self.cache.fetch(factsheet_url)
+            pdf_source = cached.path if cached else None
+            if self.archive and cached:
+                # Recorded even if the cached result is reused, so a replay can extract it again
+                with open(cached.path, 'rb') as f:
+                    self.archive.put(FACTSHEET, factsheet_url, f.read())
+            if cached and cached.result is not None:
+                self._set_result(etf, cached.result, from_cache=True)
+                return
+        else:
+            cached = None
+            pdf_source = fetch_pdf_bytes(factsheet_url)
+            if self.archive and pdf_source:
+                self.archive.put(FACTSHEET, factsheet_url, pdf_source)
+        if not pdf_source:
+            logging.info(f"ETF '{etf['name']}': Could not download PDF")
+            self._set_result(etf, '', ok=False)
+            return
+        future, executor = self._submit_extract(pdf_source, issuer_from_name(etf.get('name')))
+        future.add_done_callback(
+            lambda f, etf=etf, url=factsheet_url, cached=cached, executor=executor:
+            self._extraction_done(f, etf, url, cached, executor)
+        )
+        with self._pending_lock:
+            self._pending.append(future)
+
+    def _submit_extract(self, pdf_source, issuer):
+        """
+        Takes an extract slot and submits one parse; the slot is given back if the submit fails.
+        Returns:
+            tuple: (future, the executor it was submitted to)
+        """
+        self._extract_slots.acquire()
+        try:
+            executor = self._executor
+            try:
+                return executor.submit(timed_extract, pdf_source, issuer), executor
+            except BrokenProcessPool:
+                self._replace_broken_executor(executor)
+                executor = self._executor
+                return executor.submit(timed_extract, pdf_source, issuer), executor
+        except BaseException:
+            self._extract_slots.release()
+            raise
+
+    def _extraction_done(self, future, etf, factsheet_url, cached, executor):
+        try:
+            div_rendite, seconds = future.result()
+            metrics.record('pdf_extract', seconds, isin=etf.get('isin'), found=bool(div_rendite))
+        except BrokenProcessPool as e:
+            logging.error(f"ETF '{etf['name']}': PDF extraction failed, extractor process died: {e}")
+            metrics.record('pdf_extract', 0.0, ok=False, isin=etf.get('isin'))
+            self._replace_broken_executor(executor)
+            self._set_result(etf, '', ok=False)
+            return
+        except Exception as e:
+            logging.error(f"ETF '{etf['name']}': PDF extraction failed: {e}")
+            metrics.record('pdf_extract', 0.0, ok=False, isin=etf.get('isin'))
+            self._set_result(etf, '', ok=False)
+            return
+        finally:
+            self._extract_slots.release()
+        if cached and div_rendite:
+            try:
+                self.cache.store_result(factsheet_url, cached.sha256, div_rendite)
+            except Exception as e:
+                # Only the cache misses out; the ETF must still get its result
+                logging.error(f"ETF '{etf['name']}': could not cache the factsheet result: {e}")
+        self._set_result(etf, div_rendite)
+
+    def _set_result(self, etf, div_rendite, from_cache=False, ok=True):
+        source = " (cached)" if from_cache else ""
+        if not ok:
+            etf.setdefault('dividendenrendite', '')
+            logging.info(f"ETF '{etf['name']}': Factsheet could not be read")
+        elif div_rendite:
+            etf['dividendenrendite'] = div_rendite
+            logging.info(f"ETF '{etf['name']}': Dividendenrendite found{source}: {div_rendite}")
+        else:
+            etf['dividendenrendite'] = ''
+            logging.info(f"ETF '{etf['name']}': No Dividendenrendite found in PDF")
+        if self.on_result:
+            try:
+                self.on_result(etf, ok)
+            except Exception as e:
+                logging.error(f"ETF '{etf['name']}': result callback failed: {e}")
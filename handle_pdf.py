@@ -1,64 +1,175 @@
-import tempfile
-import requests
-
-import pdfplumber
+import io
+import re
 
 import logging
-def download_pdf(url):
+
+import metrics
+from factsheet_fields import FieldScanner, NO_DIVIDENDENRENDITE, KEYWORD_PRIORITY
+from layout_templates import LayoutTemplate, TEMPLATE_MARGIN_LINES, layout_fingerprint
+from http_client import get_http_session, HTTP_TIMEOUT
+
+
+def fetch_pdf_bytes(url):
     """
-    Downloads a PDF from the given URL to a temporary file and returns the file path.
+    Downloads a PDF from the given URL into memory.
     Args:
         url (str): The URL of the PDF to download.
     Returns:
-        str or None: The file path to the downloaded PDF, or None if download fails.
+        bytes or None: The PDF content, or None if download fails.
+    """
+    with metrics.span('pdf_download', url=url) as span:
+        try:
+            response = get_http_session().get(url, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+            span['bytes'] = len(response.content)
+            return response.content
+        except Exception as e:
+            span['ok'] = False
+            logging.error(f"Failed to download PDF from {url}: {e}")
+            return None
+
+
+def _open_pdf(source):
+    # Imported on first use, i.e. in the extractor processes, not by everything that imports this module
+    import pdfplumber
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    return pdfplumber.open(source)
+
+
+def _scan_pdf(pdf, fields, keep_stop_lines=False):
+    """
+    Runs a FieldScanner over the pages of an opened PDF, extracting one page at a time.
+    Args:
+        keep_stop_lines (bool): Also return the positioned text lines of the page the scan stopped on, taken
+            from its already parsed characters before the page is closed.
+    Returns:
+        tuple: (field results, index of the page the scan stopped on or None if every page was read,
+            that page's extract_text_lines() or None)
+    """
+    scanner = FieldScanner(fields)
+    page_texts = []
+    for index, page in enumerate(pdf.pages):
+        text = page.extract_text() or ""
+        lines = text.splitlines()
+        # Lines must match the joined document text, where pages are separated by one newline:
+        # after an empty page or one ending in a line break that separator is an empty line of its own
+        if page_texts and (not page_texts[-1] or page_texts[-1][-1] in "\n\r"):
+            lines.insert(0, "")
+        page_texts.append(text)
+        if any(scanner.feed(line) for line in lines):
+            stop_lines = page.extract_text_lines() if keep_stop_lines else None
+            page.close()
+            return scanner.results(lambda: "\n".join(page_texts)), index, stop_lines
+        page.close()  # Drop the page's cached layout objects
+    return scanner.results(lambda: "\n".join(page_texts)), None, None
+
+
+def extract_fields_from_pdf(source, fields=None):
+    """
+    Reads several fields (see factsheet_fields.FIELD_SPECS) from a PDF in one pass over its text.
+    Pages are extracted one at a time, and extraction stops as soon as every requested field is found.
+    For the Dividendenrendite that is usually on the first page.
+    Args:
+        source (str, bytes or file-like): The file path to the PDF file, its content, or a binary buffer.
+        fields (list of str): Field names. Defaults to all registered fields.
+    Returns:
+        dict: Field name -> extracted value, or the field's default if it was not found (every field's
+        default if the PDF cannot be read).
     """
     try:
-        response = requests.get(url, stream=True, timeout=30)
-        response.raise_for_status()
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            for chunk in response.iter_content(chunk_size=8192):
-                tmp_file.write(chunk)
-            return tmp_file.name
+        with _open_pdf(source) as pdf:
+            return _scan_pdf(pdf, fields)[0]
     except Exception as e:
-        logging.error(f"Failed to download PDF from {url}: {e}")
+        logging.error(f"Failed to extract factsheet fields from PDF: {e}")
+        return FieldScanner(fields).results(lambda: "")
+
+
+def _extract_in_region(pdf, template):
+    """
+    Reads the Dividendenrendite from the template's page region only.
+    Returns:
+        str or None: The value next to the top-priority keyword, or None if the region does not contain it.
+    """
+    if template.page >= len(pdf.pages):
         return None
+    page = pdf.pages[template.page]
+    x0, top, x1, bottom = template.bbox
+    bbox = (max(0, x0), max(0, top), min(page.width, x1), min(page.height, bottom))
+    if bbox[0] >= bbox[2] or bbox[1] >= bbox[3]:
+        return None
+    # within_bbox keeps whole characters only, so lines cut by the region border do not garble the text
+    text = page.within_bbox(bbox).extract_text() or ""
+    scanner = FieldScanner(['dividendenrendite'])
+    if any(scanner.feed(line) for line in text.splitlines()):
+        page.close()
+        return scanner.results(lambda: text)['dividendenrendite']
+    # On a miss the page stays parsed for the full scan that follows
+    return None
+
+
+def _learn_template(page, page_index, lines, value):
+    """
+    Finds the line pair where the top-priority keyword and value were found among a page's text lines and
+    returns its region as a LayoutTemplate, or None if it cannot be located.
+    Args:
+        page (pdfplumber.Page): The page the scan stopped on (only its size is used).
+        page_index (int): Index of that page.
+        lines (list of dict): The page's extract_text_lines(), as kept by _scan_pdf.
+        value (str): The value the scan found.
+    """
+    keyword_re = re.compile(KEYWORD_PRIORITY[0], re.IGNORECASE)
+    for index, line in enumerate(lines):
+        if not keyword_re.search(line['text']):
+            continue
+        if value in line['text']:
+            last = line
+        elif index + 1 < len(lines) and value in lines[index + 1]['text']:
+            last = lines[index + 1]
+        else:
+            continue
+        margin = (line['bottom'] - line['top']) * TEMPLATE_MARGIN_LINES
+        return LayoutTemplate(
+            page_index, (0, max(0, line['top'] - margin), page.width, min(page.height, last['bottom'] + margin))
+        )
+    return None
 
-def extract_dividendenrendite_from_pdf(pdf_path):
+
+def extract_dividendenrendite_from_pdf(source, issuer=None, templates=None):
     """
     Extracts the percentage value next to 'Dividendenrendite', 'Dividende', or 'Rendite' (case-insensitive, in that order of priority) from the PDF using pdfplumber.
     Handles cases where the value is on the same line or the next line. Only valid percentage values (e.g., 2,02%) are returned.
+    With a template store, a PDF whose layout (see layout_templates.layout_fingerprint) was seen before is
+    first read only in the page region where the value was last found. If the region does not contain it,
+    the whole PDF is scanned and the template is learned again.
     Args:
-        pdf_path (str): The file path to the PDF file.
+        source (str, bytes or file-like): The file path to the PDF file, its content, or a binary buffer.
+        issuer (str): Issuer hint for the layout fingerprint, e.g. 'ishares'.
+        templates (LayoutTemplateStore): Layout templates to use and update. None scans the whole PDF.
     Returns:
         str: The extracted value (e.g., '2,02%'), or 'no DivRendite found' if not found.
     """
-    import re
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-        lines = text.splitlines()
-        # Priority order
-        keyword_priority = [r"Dividendenrendite", r"Dividende", r"Rendite"]
-        percent_pattern = r"([\d]{1,3}[\.,][\d]{1,3}\s*%|[\d]{1,3}\s*%)"
-        for kw in keyword_priority:
-            for i, line in enumerate(lines):
-                if re.search(kw, line, re.IGNORECASE):
-                    matches = re.findall(percent_pattern, line)
-                    matches = [m.strip() for m in matches if re.search(r"\d", m)]
-                    if matches:
-                        return matches[0]
-                    if i + 1 < len(lines):
-                        matches_next = re.findall(percent_pattern, lines[i+1])
-                        matches_next = [m.strip() for m in matches_next if re.search(r"\d", m)]
-                        if matches_next:
-                            return matches_next[0]
-            # Fallback: search the whole text for keyword followed by percentage
-            match = re.search(kw + r"[\s:]*([\d]{1,3}[\.,][\d]{1,3}\s*%|[\d]{1,3}\s*%)", text, re.IGNORECASE)
-            if match:
-                val = match.group(1).strip()
-                if re.search(r"\d", val):
-                    return val
-        return 'no DivRendite found'
+        with _open_pdf(source) as pdf:
+            if templates is None:
+                return _scan_pdf(pdf, ['dividendenrendite'])[0]['dividendenrendite']
+            key = layout_fingerprint(pdf, issuer)
+            template = templates.get(key)
+            if template:
+                value = _extract_in_region(pdf, template)
+                if value:
+                    return value
+                logging.info(f"Layout template {key} missed, scanning the whole PDF")
+            # Reached on a miss only (no template yet, or the region did not contain the value)
+            results, stop_page, stop_lines = _scan_pdf(pdf, ['dividendenrendite'], keep_stop_lines=True)
+            value = results['dividendenrendite']
+            # Only a top-priority match ends the scan early; that is the place worth remembering
+            if stop_page is not None:
+                learned = _learn_template(pdf.pages[stop_page], stop_page, stop_lines, value)
+                if learned and learned != template:
+                    templates.learn(key, learned)
+            return value
     except Exception as e:
         logging.error(f"Failed to extract Dividendenrendite/Dividende/Rendite from PDF: {e}")
-        return 'no DivRendite found'
\ No newline at end of file
+        return NO_DIVIDENDENRENDITE
@@ -0,0 +1,87 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+HTTP_POOL_SIZE = 16  # Keep-alive connections per host; should cover the number of download workers
+HTTP_TIMEOUT = (5, 30)  # (connect, read) seconds
+HOST_REQUESTS_PER_MINUTE = 20  # Default request budget per host for long-running modes (see HostBudget)
+HOST_BURST = 3  # Requests a host may receive back to back before the budget paces them
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """
+    Returns the process-wide requests.Session, creating it on first use.
+    The session keeps connections alive across requests and is shared by all threads.
+    Returns:
+        requests.Session: The pooled HTTP session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                # Imported here so that importing this module (e.g. for USER_AGENT) does not load requests
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                session = requests.Session()
+                retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504),
+                              allowed_methods=frozenset(["GET", "HEAD"]))
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "User-Agent": USER_AGENT,
+                    "Accept-Language": "de-DE,de;q=0.9",
+                })
+                _session = session
+    return _session
+
+
+class HostBudget:
+    """
+    Per-host request budget: a token bucket per host that refills at requests_per_minute and holds at most
+    burst tokens. acquire() blocks until the host of a URL may be contacted again, so requests to one host
+    are spread evenly instead of arriving in bursts. Shared between threads.
+    """
+
+    def __init__(self, requests_per_minute=HOST_REQUESTS_PER_MINUTE, burst=HOST_BURST):
+        self.interval = 60.0 / requests_per_minute
+        self.burst = max(1, burst)
+        self._tokens = {}  # host -> (tokens, monotonic time of the last refill)
+        self._lock = threading.Lock()
+
+    def _reserve(self, host):
+        """Takes a token for host if one is available. Returns 0.0, or the seconds until the next token."""
+        with self._lock:
+            now = time.monotonic()
+            tokens, refilled_at = self._tokens.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - refilled_at) / self.interval)
+            if tokens >= 1:
+                self._tokens[host] = (tokens - 1, now)
+                return 0.0
+            self._tokens[host] = (tokens, now)
+            return (1 - tokens) * self.interval
+
+    def acquire(self, url, stop_event=None):
+        """
+        Blocks until a request to the host of url fits the budget, then counts it.
+        Args:
+            url (str): URL about to be requested.
+            stop_event (threading.Event): Optional; waiting ends early when it is set.
+        Returns:
+            bool: True if the request may be sent, False if stop_event was set while waiting.
+        """
+        host = urlsplit(url).netloc.lower()
+        while True:
+            delay = self._reserve(host)
+            if not delay:
+                return True
+            if stop_event is None:
+                time.sleep(delay)
+            elif stop_event.wait(delay):
+                return False
@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+JOURNAL_PATH = "scrape_journal.jsonl"
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ScrapeJournal:
+    """
+    Append-only JSONL journal of a scraper run, written as results are produced so a crash loses nothing.
+    Record types:
+        {"type": "row", "table": idx, "etf": {...}}            one parsed overview row
+        {"type": "table_done", "table": idx, "anchor": text}   all rows of a table are recorded
+        {"type": "factsheet", "isin": ..., "dividendenrendite": ..., "factsheet_checked_at": ...}
+        {"type": "complete"}                                   results were written to the database
+    With resume=True an unfinished journal is replayed: completed tables and factsheets are loaded and
+    new records are appended. Otherwise (or if the last run completed) the journal starts empty.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, path=JOURNAL_PATH, resume=False):
+        self.path = path
+        self.completed_tables = {}  # table idx -> list of ETF dicts
+        self.factsheets = {}  # ISIN -> factsheet record
+        self._lock = threading.Lock()
+        if resume and os.path.exists(path):
+            self._replay()
+        else:
+            self._reset()
+        self._file = open(path, 'a', encoding='utf-8')
+        if self._ends_mid_line():
+            # Terminate a half-written last record so new records start on their own line
+            self._file.write("\n")
+            self._file.flush()
+
+    def _ends_mid_line(self):
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def _reset(self):
+        self.completed_tables, self.factsheets = {}, {}
+        with open(self.path, 'w', encoding='utf-8'):
+            pass
+
+    def _replay(self):
+        rows_by_table = {}
+        complete = False
+        with open(self.path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave the last line half-written
+                    logging.warning(f"Journal {self.path}: skipping unreadable line {line_number}")
+                    continue
+                kind = record.get('type')
+                complete = kind == 'complete'
+                if kind == 'row':
+                    rows_by_table.setdefault(record['table'], []).append(record['etf'])
+                elif kind == 'table_done':
+                    self.completed_tables[record['table']] = rows_by_table.get(record['table'], [])
+                elif kind == 'factsheet':
+                    if record.get('factsheet_checked_at'):
+                        record['factsheet_checked_at'] = datetime.fromisoformat(record['factsheet_checked_at'])
+                    self.factsheets[record['isin']] = record
+        if complete:
+            logging.info(f"Journal {self.path} belongs to a completed run; starting fresh.")
+            self._reset()
+            return
+        logging.info(
+            f"Resuming from journal {self.path}: {len(self.completed_tables)} tables and "
+            f"{len(self.factsheets)} factsheets already done."
+        )
+
+    def _write(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=_json_default)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def record_table(self, idx, anchor_text, etf_rows):
+        """Records the parsed rows of one overview table, followed by its completion marker."""
+        for etf in etf_rows:
+            self._write({'type': 'row', 'table': idx, 'etf': etf})
+        self._write({'type': 'table_done', 'table': idx, 'anchor': anchor_text})
+        with self._lock:
+            self.completed_tables[idx] = etf_rows
+
+    def record_factsheet(self, etf):
+        """Records the factsheet result of one ETF (its 'dividendenrendite' and 'factsheet_checked_at')."""
+        if not etf.get('isin'):
+            return
+        record = {
+            'type': 'factsheet',
+            'isin': etf['isin'],
+            'dividendenrendite': etf.get('dividendenrendite', ''),
+            'factsheet_checked_at': etf.get('factsheet_checked_at'),
+        }
+        self._write(record)
+        with self._lock:
+            self.factsheets[etf['isin']] = record
+
+    def apply_factsheet(self, etf):
+        """
+        Copies a journaled factsheet result into etf.
+        Returns:
+            bool: True if the ETF's factsheet was already done in the journaled run.
+        """
+        record = self.factsheets.get(etf.get('isin'))
+        if record is None:
+            return False
+        etf['dividendenrendite'] = record['dividendenrendite']
+        etf['factsheet_checked_at'] = record['factsheet_checked_at']
+        return True
+
+    def mark_complete(self):
+        """Marks the run as written to the database, so the next --resume starts a fresh run."""
+        self._write({'type': 'complete'})
+
+    def close(self):
+        with self._lock:
+            self._file.close()
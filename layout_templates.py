@@ -0,0 +1,102 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from factsheet_cache import FACTSHEET_CACHE_DIR
+
+LAYOUT_TEMPLATES_PATH = os.path.join(FACTSHEET_CACHE_DIR, "layouts.sqlite3")
+TEMPLATE_MARGIN_LINES = 1.0  # Lines of slack above and below the learned region
+
+# Where the Dividendenrendite was found in the last factsheet of a layout: page index and
+# (x0, top, x1, bottom) in PDF points, as used by pdfplumber's within_bbox
+LayoutTemplate = namedtuple('LayoutTemplate', ['page', 'bbox'])
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def issuer_from_name(etf_name):
+    """Returns the issuer part of an ETF name ("iShares Core MSCI World ..." -> "ishares"), or ''."""
+    words = (etf_name or '').split()
+    return words[0].lower() if words else ''
+
+
+def layout_fingerprint(pdf, issuer=None):
+    """
+    Returns a key for the layout of a PDF without parsing any page content: the issuer plus the
+    document's creator/producer metadata and first page size.
+    Args:
+        pdf (pdfplumber.PDF): The opened PDF.
+        issuer (str): Issuer hint, e.g. from issuer_from_name.
+    """
+    metadata = pdf.metadata or {}
+    size = ""
+    if pdf.pages:
+        first = pdf.pages[0]
+        size = f"{round(first.width)}x{round(first.height)}"
+    return "|".join((
+        (issuer or '').lower(), str(metadata.get('Creator', '')), str(metadata.get('Producer', '')), size,
+    ))
+
+
+class LayoutTemplateStore:
+    """
+    Layout templates by fingerprint, stored in SQLite so that all extractor processes share what
+    any of them learned. Lookups are memoized per process.
+    """
+
+    def __init__(self, path=LAYOUT_TEMPLATES_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS layout_templates (
+                key TEXT PRIMARY KEY, page INTEGER, x0 REAL, top REAL, x1 REAL, bottom REAL, learned_at REAL
+            )
+            """
+        )
+        self._db.commit()
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the LayoutTemplate for key, or None if this layout has not been learned yet."""
+        with self._lock:
+            template = self._memo.get(key)
+            if template is None:
+                row = self._db.execute(
+                    "SELECT page, x0, top, x1, bottom FROM layout_templates WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    template = self._memo[key] = LayoutTemplate(row[0], tuple(row[1:]))
+            return template
+
+    def learn(self, key, template):
+        """Stores (or replaces) the template of a layout."""
+        with self._lock:
+            self._memo[key] = template
+            self._db.execute(
+                "INSERT OR REPLACE INTO layout_templates (key, page, x0, top, x1, bottom, learned_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, template.page, *template.bbox, time.time()),
+            )
+            self._db.commit()
+        logging.info(f"Learned layout template {key}: page {template.page + 1}, region {template.bbox}")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def get_layout_templates():
+    """Returns the process-wide LayoutTemplateStore, opening it on first use (in each extractor process)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = LayoutTemplateStore()
+    return _store
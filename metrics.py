@@ -0,0 +1,295 @@
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource  # Unix only; without it the report has no peak RSS
+except ImportError:
+    resource = None
+
+LOG_PATH = "scraper.log"
+LOG_MAX_BYTES = 20 * 1024 * 1024  # scraper.log is rotated at this size instead of being truncated per run
+LOG_BACKUP_COUNT = 5
+SPANS_PATH = "scraper_spans.jsonl"  # One JSON line per timed operation, appended across runs
+REPORT_PATH = "scraper_report.json"  # End-of-run summary, overwritten by every run
+
+SPAN_LOGGER = "scraper.spans"
+
+_log_queue = None
+_log_listener = None
+
+
+class _SkipSpans(logging.Filter):
+    def filter(self, record):
+        return not record.name.startswith(SPAN_LOGGER)
+
+
+def setup_logging(log_path=LOG_PATH, spans_path=SPANS_PATH):
+    """
+    Configures logging for a scraper run. Every logging call only puts the record on a queue; a listener
+    thread does the formatting and the disk I/O, so hot loops never wait on the log file.
+    scraper.log is appended to and rotated, spans go to their own JSONL file.
+    Kept out of module scope so that extractor processes, which re-import modules when started with
+    'spawn', do not set up their own file handlers.
+    Idempotent: later calls return the listener started by the first one.
+    Returns:
+        logging.handlers.QueueListener: The running listener; call stop() at exit to flush the queue.
+    """
+    global _log_queue, _log_listener
+    if _log_listener is not None:
+        return _log_listener
+    log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_path, mode='a', maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+    )
+    file_handler.setFormatter(log_formatter)
+    file_handler.setLevel(logging.INFO)
+    file_handler.addFilter(_SkipSpans())
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(log_formatter)
+    console_handler.setLevel(logging.WARNING)  # Only show warnings/errors in console
+    console_handler.addFilter(_SkipSpans())
+
+    spans_handler = logging.handlers.RotatingFileHandler(
+        spans_path, mode='a', maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+    )
+    spans_handler.setFormatter(logging.Formatter('%(message)s'))
+    spans_handler.addFilter(logging.Filter(SPAN_LOGGER))
+
+    # A multiprocessing queue, so records of the PDF extractor processes end up in the same files
+    _log_queue = multiprocessing.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        _log_queue, file_handler, console_handler, spans_handler, respect_handler_level=True
+    )
+    listener.start()
+    init_worker_logging(_log_queue)
+    _log_listener = listener
+    return listener
+
+
+def log_queue():
+    """Returns the queue set up by setup_logging, or None if logging was not set up in this process."""
+    return _log_queue
+
+
+def init_worker_logging(queue):
+    """
+    Routes this process's log records to queue. Also the process pool initializer that sends the
+    extractor processes' records to the parent's listener.
+    """
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(queue)]
+    root.setLevel(logging.INFO)
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def peak_rss_bytes():
+    """
+    Returns the peak resident set size of this process and of its terminated children (the extractor
+    processes once their pool is shut down), or None where the resource module is unavailable.
+    """
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux, in bytes on macOS
+    unit = 1 if os.uname().sysname == 'Darwin' else 1024
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit,
+    }
+
+
+class RunMetrics:
+    """
+    Timings of one scraper run, grouped by stage (driver_setup, cookie_wait, table_wait, parse_tables,
+    profile_load, pdf_download, pdf_extract, db_write).
+    Every timed operation is logged as a span (one JSON line, with the ETF's ISIN where there is one) and
+    aggregated for the end-of-run summary. Shared between threads.
+    """
+
+    def __init__(self):
+        self.run_id = time.strftime("%Y%m%dT%H%M%S")
+        self.started_at = time.time()
+        self._durations = {}  # stage -> list of seconds
+        self._errors = {}  # stage -> failed operations
+        self._bytes = {}  # stage -> bytes transferred
+        self._peaks = {}  # name -> highest observed value, e.g. browser memory
+        self._lock = threading.Lock()
+        self._span_log = logging.getLogger(SPAN_LOGGER)
+
+    def record(self, stage, seconds, ok=True, nbytes=0, **attrs):
+        """
+        Records one timed operation.
+        Args:
+            stage (str): Stage name.
+            seconds (float): Duration of the operation.
+            ok (bool): False if the operation failed or timed out.
+            nbytes (int): Bytes transferred by the operation.
+            **attrs: Extra span fields, e.g. isin or table.
+        """
+        with self._lock:
+            self._durations.setdefault(stage, []).append(seconds)
+            if not ok:
+                self._errors[stage] = self._errors.get(stage, 0) + 1
+            if nbytes:
+                self._bytes[stage] = self._bytes.get(stage, 0) + nbytes
+        if not self._span_log.isEnabledFor(logging.INFO):
+            return
+        span = {'run': self.run_id, 'stage': stage, 'ts': round(time.time(), 3), 'seconds': round(seconds, 4),
+                'ok': ok}
+        if nbytes:
+            span['bytes'] = nbytes
+        span.update(attrs)
+        self._span_log.info(json.dumps(span, ensure_ascii=False, default=str))
+
+    def observe_peak(self, name, value):
+        """Keeps the highest value observed for name (e.g. 'browser_rss_bytes') for the summary."""
+        if value is None:
+            return
+        with self._lock:
+            if value > self._peaks.get(name, value - 1):
+                self._peaks[name] = value
+
+    @contextmanager
+    def span(self, stage, **attrs):
+        """
+        Times the enclosed block as one operation of stage. The block receives the span's attributes as a
+        dict and may add fields to it; 'ok' and 'bytes' are recorded as the outcome and size. An exception
+        marks the span as failed.
+
+        Usage:
+            with metrics.span('pdf_download', url=url) as span:
+                content = download(url)
+                span['bytes'] = len(content)
+        """
+        attrs['ok'] = True
+        start = time.monotonic()
+        try:
+            yield attrs
+        except BaseException:
+            attrs['ok'] = False
+            raise
+        finally:
+            seconds = time.monotonic() - start
+            ok = bool(attrs.pop('ok'))
+            nbytes = attrs.pop('bytes', 0) or 0
+            self.record(stage, seconds, ok=ok, nbytes=nbytes, **attrs)
+
+    def summary(self):
+        """
+        Returns:
+            dict: Run duration, peak RSS, observed peaks and per stage count, errors, total/p50/p95/max
+            seconds and bytes.
+        """
+        with self._lock:
+            durations = {stage: sorted(values) for stage, values in self._durations.items()}
+            errors, nbytes, peaks = dict(self._errors), dict(self._bytes), dict(self._peaks)
+        stages = {}
+        for stage, ordered in durations.items():
+            stages[stage] = {
+                'count': len(ordered),
+                'errors': errors.get(stage, 0),
+                'total_s': round(sum(ordered), 3),
+                'p50_s': round(_percentile(ordered, 0.50), 4),
+                'p95_s': round(_percentile(ordered, 0.95), 4),
+                'max_s': round(ordered[-1], 4),
+                'bytes': nbytes.get(stage, 0),
+            }
+        return {
+            'run': self.run_id,
+            'started_at': self.started_at,
+            'duration_s': round(time.time() - self.started_at, 3),
+            'peak_rss_bytes': peak_rss_bytes(),
+            'peaks': peaks,
+            'stages': stages,
+        }
+
+    def write_report(self, path=REPORT_PATH):
+        """Writes the summary as JSON."""
+        _write_atomic(path, json.dumps(self.summary(), indent=2))
+
+    def write_prometheus(self, path):
+        """
+        Writes the summary in the Prometheus text format, e.g. for node_exporter's textfile collector.
+        """
+        summary = self.summary()
+        lines = [
+            "# HELP scraper_stage_seconds Duration of scraper operations by stage.",
+            "# TYPE scraper_stage_seconds summary",
+        ]
+        for stage, stats in summary['stages'].items():
+            for quantile, key in (("0.5", 'p50_s'), ("0.95", 'p95_s'), ("1", 'max_s')):
+                lines.append(f'scraper_stage_seconds{{stage="{stage}",quantile="{quantile}"}} {stats[key]}')
+            lines.append(f'scraper_stage_seconds_sum{{stage="{stage}"}} {stats["total_s"]}')
+            lines.append(f'scraper_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        lines += ["# HELP scraper_stage_errors Failed or timed out operations by stage.",
+                  "# TYPE scraper_stage_errors gauge"]
+        lines += [f'scraper_stage_errors{{stage="{stage}"}} {stats["errors"]}'
+                  for stage, stats in summary['stages'].items()]
+        lines += ["# HELP scraper_stage_bytes Bytes transferred by stage.", "# TYPE scraper_stage_bytes gauge"]
+        lines += [f'scraper_stage_bytes{{stage="{stage}"}} {stats["bytes"]}'
+                  for stage, stats in summary['stages'].items()]
+        lines += ["# HELP scraper_run_duration_seconds Wall time of the last run.",
+                  "# TYPE scraper_run_duration_seconds gauge",
+                  f"scraper_run_duration_seconds {summary['duration_s']}",
+                  "# HELP scraper_run_started_timestamp_seconds Start time of the last run.",
+                  "# TYPE scraper_run_started_timestamp_seconds gauge",
+                  f"scraper_run_started_timestamp_seconds {summary['started_at']:.0f}"]
+        if summary['peaks']:
+            lines += ["# HELP scraper_peak Highest observed value, e.g. browser_rss_bytes.", "# TYPE scraper_peak gauge"]
+            lines += [f'scraper_peak{{name="{name}"}} {value}' for name, value in summary['peaks'].items()]
+        if summary['peak_rss_bytes']:
+            lines += ["# HELP scraper_peak_rss_bytes Peak resident set size.", "# TYPE scraper_peak_rss_bytes gauge"]
+            lines += [f'scraper_peak_rss_bytes{{process="{process}"}} {value}'
+                      for process, value in summary['peak_rss_bytes'].items()]
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+    def log_summary(self):
+        """Logs one line per stage."""
+        summary = self.summary()
+        for stage, stats in summary['stages'].items():
+            size = f", {stats['bytes'] / 1e6:.1f} MB" if stats['bytes'] else ""
+            logging.info(
+                f"{stage}: {stats['count']} ops ({stats['errors']} failed), p50 {stats['p50_s']:.3f}s, "
+                f"p95 {stats['p95_s']:.3f}s, max {stats['max_s']:.3f}s{size}"
+            )
+        if summary['peak_rss_bytes']:
+            rss = summary['peak_rss_bytes']
+            logging.info(f"Peak RSS: {rss['self'] / 1e6:.0f} MB (extractor processes {rss['children'] / 1e6:.0f} MB)")
+        for name, value in summary['peaks'].items():
+            logging.info(f"Peak {name}: {value}")
+
+
+def _write_atomic(path, content):
+    # Readers (e.g. a textfile collector) must never see a half-written file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+# The metrics of the current run, used by all modules
+RUN = RunMetrics()
+
+
+def span(stage, **attrs):
+    """Times a block as one operation of stage on the current run, see RunMetrics.span."""
+    return RUN.span(stage, **attrs)
+
+
+def observe_peak(name, value):
+    """Keeps the highest value observed for name on the current run, see RunMetrics.observe_peak."""
+    RUN.observe_peak(name, value)
+
+
+def record(stage, seconds, ok=True, nbytes=0, **attrs):
+    """Records one timed operation on the current run, see RunMetrics.record."""
+    RUN.record(stage, seconds, ok=ok, nbytes=nbytes, **attrs)
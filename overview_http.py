@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from html import escape
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import metrics
+from http_client import get_http_session, HTTP_TIMEOUT
+
+OVERVIEW_ENDPOINTS_PATH = ".overview_endpoints.json"  # Verified data URL per overview table, learned by the browser path
+HTTP_TABLE_WORKERS = 8  # Concurrent requests for table pages
+
+# Returns the URLs of the XHR/fetch requests the page made after the first arguments[0] resource entries
+NEW_XHR_URLS_SCRIPT = """
+return performance.getEntriesByType('resource').slice(arguments[0])
+    .filter((entry) => entry.initiatorType === 'xmlhttprequest' || entry.initiatorType === 'fetch')
+    .map((entry) => entry.name);
+"""
+RESOURCE_COUNT_SCRIPT = "return performance.getEntriesByType('resource').length;"
+
+# DataTables server-side paging parameters: (offset, page size), current and legacy protocol
+_PAGING_PARAMS = (('start', 'length'), ('iDisplayStart', 'iDisplayLength'))
+_CDATA_RE = re.compile(r"<!\[CDATA\[|\]\]>")
+
+_store = None
+_store_lock = threading.Lock()
+
+
+class EndpointStore:
+    """
+    The data URL of each overview table, keyed by anchor text, persisted as JSON so later runs can read the
+    tables without a browser. Also remembers when learning a table's URL last failed, so that runs do not
+    probe such tables again and again. Safe to share between threads.
+    """
+
+    def __init__(self, path=OVERVIEW_ENDPOINTS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        if isinstance(data.get('endpoints'), dict):
+            self._endpoints = data['endpoints']
+            self._failed = data.get('failed') or {}
+        else:
+            # Files written before failed attempts were stored: a flat anchor text -> URL mapping
+            self._endpoints, self._failed = data, {}
+
+    def get(self, anchor_text):
+        with self._lock:
+            return self._endpoints.get(anchor_text)
+
+    def put(self, anchor_text, url):
+        """Stores url for a table; url None forgets the table's endpoint (e.g. after it stopped working)."""
+        with self._lock:
+            if url is None:
+                if self._endpoints.pop(anchor_text, None) is None:
+                    return
+            else:
+                self._endpoints[anchor_text] = url
+                self._failed.pop(anchor_text, None)
+            self._save()
+
+    def failed_at(self, anchor_text):
+        """Returns the epoch seconds of the last failed attempt to learn a table's URL, or None."""
+        with self._lock:
+            return self._failed.get(anchor_text)
+
+    def put_failed(self, anchor_text, at=None):
+        """Records a failed attempt to learn a table's URL (at: epoch seconds, default now)."""
+        with self._lock:
+            self._failed[anchor_text] = at if at is not None else time.time()
+            self._save()
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'endpoints': self._endpoints, 'failed': self._failed}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"Could not save overview endpoints: {e}")
+
+
+def _get(url, budget=None):
+    if budget is not None:
+        budget.acquire(url)
+    with metrics.span('table_http', url=url) as span:
+        response = get_http_session().get(url, timeout=HTTP_TIMEOUT, headers={'X-Requested-With': 'XMLHttpRequest'})
+        span['status'] = response.status_code
+        response.raise_for_status()
+        span['bytes'] = len(response.content)
+        return response.text
+
+
+def _paging(url):
+    """Returns (offset name, size name, page size) if url requests one page of a server-side DataTable, else None."""
+    query = dict(parse_qsl(urlsplit(url).query))
+    for start, length in _PAGING_PARAMS:
+        if start in query and query.get(length, '').isdigit() and int(query[length]) > 0:
+            return start, length, int(query[length])
+    return None
+
+
+def page_size(url):
+    """Returns the page size if url requests one page of a server-side DataTable, else None."""
+    paging = _paging(url)
+    return paging[2] if paging else None
+
+
+def _page_url(url, start_name, offset):
+    parts = urlsplit(url)
+    query = [(key, str(offset) if key == start_name else value) for key, value in parse_qsl(parts.query)]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _json_rows(text):
+    """Returns (rows, total) of a DataTables JSON response, or None if text is not one (or rows are objects)."""
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    rows = payload.get('data', payload.get('aaData'))
+    if not isinstance(rows, list) or any(not isinstance(row, list) for row in rows):
+        return None
+    total = payload.get('recordsFiltered', payload.get('recordsTotal', payload.get('iTotalDisplayRecords')))
+    return rows, total if isinstance(total, int) else len(rows)
+
+
+def _rows_html(table_name, rows):
+    """Renders DataTables array rows (cell HTML) as the h3/table markup the overview parser reads."""
+    body = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows)
+    return f'<h3>{escape(table_name)}</h3><table class="table-striped"><tbody>{body}</tbody></table>'
+
+
+def fetch_table_html(url, table_name, executor=None, budget=None):
+    """
+    Fetches the rows of one overview table from its data URL and returns them as overview markup.
+    JSON responses in the DataTables array format are paged through: the remaining pages after the first
+    are requested concurrently on executor. HTML fragments and Wicket ajax responses are returned as they
+    are, behind an h3 with the table name.
+    Args:
+        url (str): The table's data URL, as recorded from the browser.
+        table_name (str): Anchor text of the table.
+        executor (ThreadPoolExecutor): Pool for the page requests; pages are fetched one by one without.
+        budget (HostBudget): Optional; every request (first and further pages) waits for its budget.
+    Returns:
+        str: HTML for parse_tables_html.
+    Raises:
+        requests.RequestException: If a request fails.
+    """
+    text = _get(url, budget)
+    parsed = _json_rows(text)
+    if parsed is None:
+        return f"<h3>{escape(table_name)}</h3>" + _CDATA_RE.sub("", text)
+    rows, total = parsed
+    paging = _paging(url)
+    if paging and rows and total > len(rows):
+        start_name, _, page_size = paging
+        first = int(dict(parse_qsl(urlsplit(url).query))[start_name])
+        page_urls = [_page_url(url, start_name, offset) for offset in range(first + page_size, total, page_size)]
+        fetch = executor.map if executor else map
+        for page_text in fetch(partial(_get, budget=budget), page_urls):
+            page = _json_rows(page_text)
+            if page is None:
+                raise ValueError(f"Unexpected page response for table {table_name}")
+            rows.extend(page[0])
+    return _rows_html(table_name, rows)
+
+
+def fetch_tables_html(urls_by_table, workers=HTTP_TABLE_WORKERS):
+    """
+    Fetches several overview tables concurrently, see fetch_table_html.
+    Args:
+        urls_by_table (dict): Anchor text -> data URL.
+        workers (int): Concurrent table requests, and as many concurrent page requests.
+    Returns:
+        dict: Anchor text -> HTML, for the tables that could be fetched.
+    """
+    results = {}
+    if not urls_by_table:
+        return results
+    # Separate pools for tables and pages: a table waiting for its pages must not block the page requests
+    with ThreadPoolExecutor(max_workers=workers) as table_pool, ThreadPoolExecutor(max_workers=workers) as page_pool:
+        futures = {
+            table_pool.submit(fetch_table_html, url, table_name, page_pool): table_name
+            for table_name, url in urls_by_table.items()
+        }
+        for future, table_name in futures.items():
+            try:
+                results[table_name] = future.result()
+            except Exception as e:
+                logging.warning(f"HTTP fetch of table '{table_name}' failed: {e}")
+    return results
+
+
+def get_table_endpoints():
+    """Returns the process-wide EndpointStore, loading it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = EndpointStore()
+    return _store
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+ARCHIVE_DIR = "scrape_archive"
+ARCHIVE_COMPRESSION_LEVEL = 6  # zlib level of the stored objects; HTML shrinks ~10x, PDFs only a little
+
+# Kinds of recorded documents, keyed by: anchor text of the table / profile URL / factsheet URL
+OVERVIEW = 'overview'
+PROFILE = 'profile'
+FACTSHEET = 'factsheet'
+
+ArchiveEntry = namedtuple('ArchiveEntry', ['kind', 'key', 'sha256', 'size', 'recorded_at', 'meta'])
+
+_worker_archives = {}
+
+
+class ScrapeArchive:
+    """
+    Local archive of everything a scraper run fetched: overview page HTML per table, profile page HTML and
+    factsheet PDFs. Documents are stored once per content hash, zlib compressed, under
+    <archive_dir>/objects/<aa>/<sha256>.z; the index (<archive_dir>/index.sqlite3) maps (kind, key) to the
+    latest recorded content. Replaying a run from the archive needs neither the network nor a browser.
+    Safe to share between the threads of one process; every process opens its own instance.
+    """
+
+    def __init__(self, archive_dir=ARCHIVE_DIR, replay=False, compression_level=ARCHIVE_COMPRESSION_LEVEL):
+        """
+        Args:
+            archive_dir (str): Directory of the archive.
+            replay (bool): Open an existing archive for reading; put() is not allowed.
+            compression_level (int): zlib level for new objects.
+        Raises:
+            FileNotFoundError: In replay mode, if archive_dir contains no archive.
+        """
+        self.archive_dir = archive_dir
+        self.replay = replay
+        self.compression_level = compression_level
+        self.objects_dir = os.path.join(archive_dir, 'objects')
+        index_path = os.path.join(archive_dir, 'index.sqlite3')
+        if replay and not os.path.exists(index_path):
+            raise FileNotFoundError(f"No scrape archive in {archive_dir}")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(index_path, timeout=30, check_same_thread=False)
+        if not replay:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS documents (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    recorded_at REAL NOT NULL,
+                    meta TEXT,
+                    PRIMARY KEY (kind, key)
+                )
+                """
+            )
+            self._db.commit()
+
+    def _object_path(self, sha256):
+        return os.path.join(self.objects_dir, sha256[:2], f"{sha256}.z")
+
+    def put(self, kind, key, content, **meta):
+        """
+        Records one fetched document, replacing an earlier recording of the same kind and key.
+        Identical content is stored only once.
+        Args:
+            kind (str): OVERVIEW, PROFILE or FACTSHEET.
+            key (str): Anchor text of the table, or the URL of the page / PDF.
+            content (str or bytes): The document; text is stored UTF-8 encoded.
+            **meta: JSON serializable details, e.g. the table index.
+        Returns:
+            str: SHA-256 of the content.
+        """
+        if self.replay:
+            raise ValueError("Scrape archive is opened for replay")
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        sha256 = hashlib.sha256(content).hexdigest()
+        path = self._object_path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(zlib.compress(content, self.compression_level))
+            os.replace(tmp_path, path)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO documents (kind, key, sha256, size, recorded_at, meta) VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, key, sha256, len(content), time.time(), json.dumps(meta) if meta else None),
+            )
+            self._db.commit()
+        return sha256
+
+    def entry(self, kind, key):
+        """Returns the ArchiveEntry recorded for kind and key, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT kind, key, sha256, size, recorded_at, meta FROM documents WHERE kind = ? AND key = ?",
+                (kind, key),
+            ).fetchone()
+        return self._to_entry(row) if row else None
+
+    def entries(self, kind):
+        """Returns all ArchiveEntries of a kind in recording order."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT kind, key, sha256, size, recorded_at, meta FROM documents WHERE kind = ? ORDER BY recorded_at",
+                (kind,),
+            ).fetchall()
+        return [self._to_entry(row) for row in rows]
+
+    @staticmethod
+    def _to_entry(row):
+        return ArchiveEntry(*row[:5], json.loads(row[5]) if row[5] else {})
+
+    def get(self, kind, key):
+        """
+        Returns the recorded content of kind and key.
+        Returns:
+            bytes or None: The content, or None if it was not recorded (or its object is missing).
+        """
+        entry = self.entry(kind, key)
+        if entry is None:
+            return None
+        try:
+            with open(self._object_path(entry.sha256), 'rb') as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error) as e:
+            logging.error(f"Archived {kind} {key} could not be read: {e}")
+            return None
+
+    def get_text(self, kind, key):
+        """Returns the recorded content of kind and key decoded as UTF-8, or None."""
+        content = self.get(kind, key)
+        return content.decode('utf-8', errors='replace') if content is not None else None
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def open_replay_archive(archive_dir=ARCHIVE_DIR):
+    """Returns a ScrapeArchive for replay, opened once per process (for pool workers)."""
+    archive = _worker_archives.get(archive_dir)
+    if archive is None:
+        archive = _worker_archives[archive_dir] = ScrapeArchive(archive_dir, replay=True)
+    return archive
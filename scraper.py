@@ -1,97 +1,244 @@
 import time
-# import requests # No longer needed
-from bs4 import BeautifulSoup
 import logging
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.support import expected_conditions as EC
-from write_to_db import *
-from handle_pdf import *
-import os
-import tempfile
-import requests
-import PyPDF2
-import pdfplumber
 import random
+import queue
+import waits
+import metrics
+import threading
+import argparse
+import chromedriver
+from datetime import datetime, timedelta, timezone
+from http_client import get_http_session, HTTP_TIMEOUT, USER_AGENT
+from driver_pool import DriverPool, BROWSER_POOL_SIZE, is_driver_alive, browser_rss_bytes
+from factsheet_cache import FactsheetCache
+from journal import ScrapeJournal, JOURNAL_PATH
+from factsheet_pipeline import FactsheetPipeline, DOWNLOAD_WORKERS, EXTRACT_WORKERS, QUEUE_SIZE
+from scrape_archive import ScrapeArchive, open_replay_archive, ARCHIVE_DIR, OVERVIEW, PROFILE
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from overview_http import get_table_endpoints, fetch_tables_html, fetch_table_html, page_size, NEW_XHR_URLS_SCRIPT, RESOURCE_COUNT_SCRIPT
+# bs4 (HTML parsing) and write_to_db (SQLAlchemy) are imported by the stages that use them, so startup
+# to the first driver.get only loads Selenium.
 
-log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-file_handler = logging.FileHandler('scraper.log', mode='w', encoding='utf-8')
-file_handler.setFormatter(log_formatter)
-file_handler.setLevel(logging.INFO)
-
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(log_formatter)
-console_handler.setLevel(logging.WARNING)  # Only show warnings/errors in console
-
-logging.basicConfig(level=logging.INFO, handlers=[file_handler, console_handler])
 
 URL = "https://www.justetf.com/de/etf-list-overview.html#aktien_digitalisierung"
 BASE_URL = "https://www.justetf.com"
-PAGE_LOAD_TIMEOUT = random.randint(30, 900)  # Randomized each run
-ELEMENT_WAIT_TIMEOUT = random.randint(30, 900)
-# Log chosen dynamic timeouts
-logging.info(f"PAGE_LOAD_TIMEOUT set to {PAGE_LOAD_TIMEOUT}s, ELEMENT_WAIT_TIMEOUT set to {ELEMENT_WAIT_TIMEOUT}s")
 COOKIE_BUTTON_TEXT = "Auswahl erlauben"
 MAX_TABLES = 5  # Maximum number of tables to process
 MIN_TABLE = 1  # 1-based index of the first table to process
+USE_HTTP_PROFILE_FETCH = True  # Read profile pages over plain HTTP; the browser is only used as a fallback
+FACTSHEET_LINK_TITLE = "Factsheet (DE)"
+USE_HTTP_TABLE_FETCH = True  # Read overview tables from their learned data URL; the browser path is the fallback
+TABLE_ENDPOINT_CANDIDATES = 3  # Latest XHR/fetch requests of a table load that are probed as its data URL
+TABLE_ENDPOINT_RETRY_HOURS = 24  # A table whose data URL could not be learned is not probed again sooner
+TABLE_EXTRACTION_MODE = 'script'  # 'script': rows extracted in the browser in one call; 'soup': parse page_source
+USE_FACTSHEET_CACHE = True  # Revalidate factsheets against the local cache instead of re-downloading them
+INCREMENTAL_MODE = False  # Only read factsheets of new, changed or stale ISINs (see select_factsheet_work)
+FACTSHEET_MAX_AGE_DAYS = 30  # In incremental mode, factsheets checked longer ago than this are read again
+ARCHIVE = None  # ScrapeArchive every fetched overview table, profile page and factsheet is recorded into (--record)
+REQUEST_BUDGET = None  # HostBudget for profile pages and table data URL probes (set by the daemon); None: unlimited
+LEAN_DRIVER = True  # Headless Chrome with eager page loads and images, fonts, media and trackers blocked
+# URL patterns the lean driver never loads (Network.setBlockedURLs, '*' is a wildcard). Scripts, styles and the
+# Cookiebot consent banner stay allowed: the overview tables and the cookie button depend on them.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*googleadservices.com*", "*facebook.net*", "*facebook.com/tr*", "*hotjar.com*", "*bing.com*",
+    "*linkedin.com*", "*taboola.com*", "*outbrain.com*", "*criteo.com*", "*adnxs.com*", "*youtube.com*",
+]
+# Overview columns whose change means the stored Dividendenrendite may be outdated
+# (ytd and fondsgröße move daily and are therefore not compared)
+FACTSHEET_RELEVANT_FIELDS = ('name', 'ter', 'ausschüttung', 'replikation')
 
 
-# Helper to provide a random timeout between 30 and 300 s
-def get_random_timeout() -> int:
-    """Return a random timeout between 30 and 300 seconds (inclusive)."""
-    return random.randint(30, 300)
-
-def setup_driver():
+def setup_driver(headless=False, lean=None):
     """
     Sets up the Selenium WebDriver with Chrome and returns the driver instance.
+    Args:
+        headless (bool): Run Chrome without a window (used for the pooled drivers).
+        lean (bool): Headless with the 'eager' page load strategy (driver.get returns at DOMContentLoaded,
+            the waits take over from there), no background services and BLOCKED_URL_PATTERNS never loaded.
+            Defaults to LEAN_DRIVER.
     Returns:
         webdriver.Chrome: The configured Selenium WebDriver instance, or None if setup fails.
     """
     options = webdriver.ChromeOptions()
-    # options.add_argument("--headless") # Keep visible for now
+    lean = LEAN_DRIVER if lean is None else lean
+    headless = headless or lean
+    if lean:
+        options.page_load_strategy = 'eager'
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        for flag in ("--disable-extensions", "--disable-background-networking", "--disable-component-update",
+                     "--disable-default-apps", "--disable-sync", "--no-first-run", "--mute-audio"):
+            options.add_argument(flag)
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+    options.add_argument(f"user-agent={USER_AGENT}")
     #options.add_argument("--start-maximized") # Start maximized to help with element visibility
 
+    with metrics.span('driver_setup', headless=headless, lean=lean) as span:
+        try:
+            try:
+                driver = webdriver.Chrome(service=ChromeService(chromedriver.resolve_chromedriver_path()),
+                                          options=options)
+            except WebDriverException as e:
+                if chromedriver.OFFLINE:
+                    raise
+                # The cached chromedriver may no longer match an updated Chrome: resolve it again once
+                logging.warning(f"Chrome did not start with the resolved chromedriver, resolving again: {e}")
+                chromedriver.invalidate_chromedriver_cache()
+                driver = webdriver.Chrome(service=ChromeService(chromedriver.resolve_chromedriver_path()),
+                                          options=options)
+            # Set again before every navigation by waits.load_page, from the learned page load times
+            driver.set_page_load_timeout(waits.PAGE_LOAD.current())
+            if lean:
+                block_heavy_resources(driver)
+            logging.info("WebDriver setup complete.")
+            return driver
+        except WebDriverException as e:
+            span['ok'] = False
+            logging.error(f"WebDriver setup failed: {e}")
+            return None
+        except Exception as e:
+            span['ok'] = False
+            logging.error(f"Unexpected error during WebDriver setup: {e}")
+            return None
+
+
+def block_heavy_resources(driver, patterns=BLOCKED_URL_PATTERNS):
+    """
+    Makes Chrome drop requests for URLs matching patterns before they are sent (images, fonts, media and
+    third-party trackers), via the DevTools Network domain. Applies to all later page loads of the driver.
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance.
+        patterns (list of str): URL patterns, '*' matches any characters.
+    """
     try:
-        service = ChromeService(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
-        logging.info("WebDriver setup complete.")
-        return driver
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
     except WebDriverException as e:
-        logging.error(f"WebDriver setup failed: {e}")
-        return None
-    except Exception as e:
-        logging.error(f"Unexpected error during WebDriver setup: {e}")
-        return None
+        logging.warning(f"Could not block heavy resources, loading pages in full: {e}")
+
+
+# Runs in the browser and returns the Ausschütt rows of the table parse_tables_html would pick, as compact JSON:
+# {table_name, total_rows, rows: [{cells: [8 stripped cell texts], name, href}]}. Mirrors its selection rules:
+# the first striped table after the h3 containing arguments[0], else the first h3/table pair.
+TABLE_ROWS_SCRIPT = """
+const expected = (arguments[0] || '').toLowerCase();
+// Same as BeautifulSoup get_text(strip=True): stripped text nodes joined without separator
+const strippedText = (el) => {
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    const parts = [];
+    while (walker.nextNode()) {
+        const text = walker.currentNode.nodeValue.trim();
+        if (text) { parts.push(text); }
+    }
+    return parts.join('');
+};
+const pairs = [];
+let openHeaders = [];
+for (const el of document.querySelectorAll('h3, table.table-striped')) {
+    if (el.tagName === 'H3') {
+        openHeaders.push(strippedText(el));
+    } else {
+        for (const header of openHeaders) { pairs.push([header, el]); }
+        openHeaders = [];
+    }
+}
+if (!pairs.length) { return null; }
+let target = expected ? pairs.find(([header]) => header.toLowerCase().includes(expected)) : null;
+if (!target) { target = pairs[0]; }
+const [tableName, table] = target;
+const tbody = table.querySelector('tbody');
+if (!tbody) { return {table_name: tableName, total_rows: null, rows: []}; }
+const trs = tbody.querySelectorAll('tr');
+const rows = [];
+for (const tr of trs) {
+    const tds = Array.from(tr.children).filter((c) => c.tagName === 'TD');
+    if (tds.length < 8 || !strippedText(tds[5]).startsWith('Ausschütt')) { continue; }
+    const link = tds[0].querySelector('a');
+    if (!link || link.querySelector('i')) { continue; }  // 'i' is tag for Sparplan which we don't want
+    rows.push({cells: tds.slice(0, 8).map(strippedText), name: strippedText(link), href: link.getAttribute('href')});
+}
+return {table_name: tableName, total_rows: trs.length, rows: rows};
+"""
 
 
-def parse_tables(driver, expected_table_name=None, timeout=ELEMENT_WAIT_TIMEOUT):
+def make_etf_data(cells, etf_name, href, table_name):
     """
-    Parses the current table that was navigated to via anchor click.
+    Builds the ETF data dict for one overview table row.
+    Args:
+        cells (list of str): Stripped texts of the row's first 8 columns.
+        etf_name (str): Text of the ETF's profile link.
+        href (str): href of the profile link (relative or absolute).
+        table_name (str): Header of the table the row belongs to.
+    Returns:
+        dict: ETF data (keys: 'name', 'ter', 'ytd', 'fondsgröße', 'auflagedatum', 'ausschüttung', 'replikation', 'isin', 'row', 'profile_url', 'table_name').
+    """
+    profile_url = BASE_URL + href if href and href.startswith('/') else href
+    return {
+        'name': etf_name,
+        'ter': cells[1],
+        'ytd': cells[2],
+        'fondsgröße': cells[3],
+        'auflagedatum': cells[4],
+        'ausschüttung': cells[5],
+        'replikation': cells[6],
+        'isin': cells[7],
+        'row': list(cells[:8]),
+        'profile_url': profile_url,
+        'table_name': table_name
+    }
+
+
+def extract_table_rows_script(driver, expected_table_name=None):
+    """
+    Extracts the Ausschütt rows of the current table with a single execute_script call.
+    The browser selects the table, filters the rows and returns only the needed cell texts,
+    so no page_source copy is transferred or parsed.
     Args:
         driver (webdriver.Chrome): The Selenium WebDriver instance.
         expected_table_name (str): The name of the table we expect to find (from the anchor text).
-        timeout (int): The timeout for WebDriverWait.
     Returns:
-        list of dict: Each dict contains ETF data for a row (columns 1-8, keys: 'name', 'ter', 'ytd', 'fondsgröße', 'auflagedatum', 'ausschüttung', 'replikation', 'isin', 'row', 'profile_url').
+        list of dict: ETF data dicts, see make_etf_data.
     """
-    # Wait for table to be visible
-    try:
-        WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "table.table.table-striped.dataTable.no-footer"))
-        )
-    except TimeoutException:
-        logging.warning("Timeout waiting for table to be visible")
+    result = driver.execute_script(TABLE_ROWS_SCRIPT, expected_table_name)
+    if not result:
+        logging.warning("No tables found on the page")
+        return []
+    table_name = result['table_name']
+    logging.info(f"\nProcessing {table_name}...")
+    if result['total_rows'] is None:
+        logging.warning(f"{table_name}: No tbody found. Skipping.")
         return []
+    etf_rows = [make_etf_data(row['cells'], row['name'], row['href'], table_name) for row in result['rows']]
+    logging.info(f"{table_name}: {result['total_rows']} rows, {len(etf_rows)} Ausschütt matches.")
+    return etf_rows
 
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
+
+def parse_tables_html(html, expected_table_name=None):
+    """
+    Parses the Ausschütt rows of one table from overview page HTML.
+    Only h3 headers and tables are kept by the parser, the rest of the page is skipped.
+    Args:
+        html (str): HTML of the overview page.
+        expected_table_name (str): The name of the table we expect to find (from the anchor text).
+    Returns:
+        list of dict: ETF data dicts, see make_etf_data.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer(['h3', 'table']))
     
     # Find all tables and their associated h3 headers
     tables_with_headers = []
@@ -128,7 +275,6 @@ def parse_tables(driver, expected_table_name=None, timeout=ELEMENT_WAIT_TIMEOUT)
             
     rows = table_body.find_all('tr')
     total_rows = len(rows)
-    match_count = 0
     for row in rows:
         columns = row.find_all('td', recursive=False)
         if len(columns) >= 8:
@@ -137,31 +283,45 @@ def parse_tables(driver, expected_table_name=None, timeout=ELEMENT_WAIT_TIMEOUT)
                 # Extract ETF name from first <a> in first <td> (without <i> tag)
                 first_td = columns[0]
                 link_tag = first_td.find('a')
-                if link_tag and not link_tag.find('i'): # 'i' is tag for Sparplan which we don't want
-                    etf_name = link_tag.get_text(strip=True)
-                    href = link_tag.get('href')
-                    profile_url = BASE_URL + href if href and href.startswith('/') else href
-                else:
+                if not link_tag or link_tag.find('i'): # 'i' is tag for Sparplan which we don't want
                     continue  # skip if no valid anchor
-                match_count += 1
-                etf_data = {
-                    'name': etf_name,
-                    'ter': columns[1].get_text(strip=True),
-                    'ytd': columns[2].get_text(strip=True),
-                    'fondsgröße': columns[3].get_text(strip=True),
-                    'auflagedatum': columns[4].get_text(strip=True),
-                    'ausschüttung': columns[5].get_text(strip=True),
-                    'replikation': columns[6].get_text(strip=True),
-                    'isin': columns[7].get_text(strip=True),
-                    'row': [c.get_text(strip=True) for c in columns[:8]],
-                    'profile_url': profile_url,
-                    'table_name': table_name
-                }
-                etf_rows.append(etf_data)
-    logging.info(f"{table_name}: {total_rows} rows, {match_count} Ausschütt matches.")
+                cells = [c.get_text(strip=True) for c in columns[:8]]
+                etf_rows.append(make_etf_data(cells, link_tag.get_text(strip=True), link_tag.get('href'), table_name))
+    logging.info(f"{table_name}: {total_rows} rows, {len(etf_rows)} Ausschütt matches.")
     return etf_rows
 
 
+def parse_tables(driver, expected_table_name=None, timeout=waits.TABLE_LOAD):
+    """
+    Parses the current table that was navigated to via anchor click.
+    With TABLE_EXTRACTION_MODE 'script' the rows are extracted in the browser in one call;
+    'soup' (and any script error) parses the page source instead.
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance.
+        expected_table_name (str): The name of the table we expect to find (from the anchor text).
+        timeout (waits.AdaptiveTimeout): The learned timeout for the table wait.
+    Returns:
+        list of dict: Each dict contains ETF data for a row (columns 1-8, keys: 'name', 'ter', 'ytd', 'fondsgröße', 'auflagedatum', 'ausschüttung', 'replikation', 'isin', 'row', 'profile_url').
+    """
+    # Wait for table to be visible
+    try:
+        waits.wait_until(
+            driver, EC.presence_of_element_located((By.CSS_SELECTOR, "table.table.table-striped.dataTable.no-footer")),
+            timeout, "table visible"
+        )
+    except TimeoutException:
+        logging.warning("Timeout waiting for table to be visible")
+        return []
+
+    if TABLE_EXTRACTION_MODE == 'script':
+        try:
+            return extract_table_rows_script(driver, expected_table_name)
+        except WebDriverException as e:
+            if not is_driver_alive(driver):
+                raise
+            logging.warning(f"Script table extraction failed, parsing page source instead: {e}")
+    return parse_tables_html(driver.page_source, expected_table_name)
+
 
 def scroll_to_load_all_tables(driver):
     """
@@ -180,22 +340,16 @@ def scroll_to_load_all_tables(driver):
     while scrolls < max_scrolls:
         # Scroll down in steps of 800-1000 pixels
         driver.execute_script(f"window.scrollBy(0, {random.randint(800, 1000)});")
-        time.sleep(0.5)  # Short pause between scrolls
         
-        # Every few scrolls, wait a bit longer to let content load
-        if scrolls % 5 == 0:
-            logging.info(f"Completed {scrolls} scrolls, pausing to let content load...")
-            time.sleep(2)
-        
-        # Check if we've reached the bottom
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            # Try one more time with a longer wait
-            time.sleep(3)
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                logging.info("Reached the bottom of the page")
-                break
+        # Wait until lazy content grows the page; no growth within the learned timeout means we are at the bottom
+        try:
+            new_height = waits.wait_until(
+                driver, waits.script_value_changed("return document.body.scrollHeight", last_height),
+                waits.SCROLL, "page height grows"
+            )
+        except TimeoutException:
+            logging.info("Reached the bottom of the page")
+            break
         
         last_height = new_height
         scrolls += 1
@@ -203,15 +357,264 @@ def scroll_to_load_all_tables(driver):
     # Scroll back to top to ensure we can parse from the beginning
     logging.info("Scrolling back to top of the page...")
     driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(2)  # Wait for the page to stabilize
     
     # Count tables after scrolling
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(driver.page_source, 'html.parser')
     tables_count = len(soup.select("table.table.table-striped.dataTable.no-footer"))
     logging.info(f"After scrolling, found {tables_count} tables on the page")
 
 
-def parse_all_tables_by_anchors(driver, max_tables=MAX_TABLES, min_table=MIN_TABLE):
+OVERVIEW_ANCHOR_COUNT_SCRIPT = "return document.querySelectorAll('a[class=\"light-link\"]').length;"
+
+CLICK_ANCHOR_SCRIPT = """
+const anchor = Array.from(document.querySelectorAll('a[class="light-link"]')).find(a => a.href === arguments[0]);
+if (!anchor) { return false; }
+anchor.click();
+return true;
+"""
+
+
+def accept_cookies(driver):
+    """
+    Accepts the cookie consent pop-up if it is shown.
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance.
+    Returns:
+        bool: True if the banner was accepted and closed.
+    """
+    cookie_button_xpath = f"//button[normalize-space()='{COOKIE_BUTTON_TEXT}']"
+    try:
+        logging.info(f"Waiting for cookie consent button: '{COOKIE_BUTTON_TEXT}'...")
+        cookie_button = waits.wait_until(
+            driver, EC.element_to_be_clickable((By.XPATH, cookie_button_xpath)), waits.COOKIE_BANNER
+        )
+        logging.info("Cookie button found. Clicking...")
+        cookie_button.click()
+        logging.info("Clicked cookie button. Waiting for the banner to close...")
+    except TimeoutException:
+        logging.warning(f"Cookie button '{COOKIE_BUTTON_TEXT}' not found. Proceeding...")
+        return False
+    except Exception as e:
+        logging.error(f"Error clicking cookie button: {e}. Proceeding...")
+        return False
+    try:
+        waits.wait_until(driver, EC.invisibility_of_element_located((By.XPATH, cookie_button_xpath)),
+                         waits.COOKIE_BANNER, "cookie banner closed")
+        return True
+    except TimeoutException:
+        logging.warning("Cookie banner still visible after clicking. Proceeding...")
+    except Exception as e:
+        logging.error(f"Error waiting for cookie banner to close: {e}. Proceeding...")
+    return False
+
+
+def open_overview(driver, accept_cookie_banner=True):
+    """
+    Loads the ETF overview page, handles the cookie consent pop-up and waits for the page to settle.
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance.
+        accept_cookie_banner (bool): Wait for the cookie banner and accept it. False for a session that
+            already accepted it, where the banner is not shown again and waiting for it would only time out.
+    Returns:
+        bool: True if the overview page is ready, False if it could not be loaded.
+    """
+    try:
+        logging.info(f"Fetching data from {URL}...")
+        with metrics.span('page_load', page='overview'):
+            waits.load_page(driver, URL)
+        if accept_cookie_banner:
+            with metrics.span('cookie_wait') as span:
+                span['ok'] = accept_cookies(driver)
+        logging.info("Waiting for page content to stabilize after navigation/cookie handling...")
+        # Ready once the table anchor list is rendered and no longer growing
+        waits.wait_until(driver, waits.script_value_stable(OVERVIEW_ANCHOR_COUNT_SCRIPT), waits.OVERVIEW_READY,
+                         "overview anchors")
+        return is_driver_alive(driver)
+    except TimeoutException:
+        logging.warning("Overview page did not settle; proceeding with what is loaded.")
+        return is_driver_alive(driver)
+    except WebDriverException as e:
+        logging.error(f"Could not open overview page: {e}")
+        return False
+
+
+def collect_aktien_anchors(driver, min_table=MIN_TABLE):
+    """
+    Collects the 'Aktien' table anchor links from the overview page.
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance, on the overview page.
+        min_table (int): 1-based index of the first table to return. Defaults to MIN_TABLE.
+    Returns:
+        list of tuple: (table index, anchor text, anchor href) for every table from min_table on.
+    """
+    anchors = driver.find_elements(By.CSS_SELECTOR, 'a[href*="aktien"]' and 'a[class="light-link"]')
+    aktien_anchors = [(a.text.strip(), a.get_attribute('href')) for a in anchors if "aktien" in a.get_attribute('href').lower()]
+    logging.info(f"Found {len(aktien_anchors)} 'Aktien' table anchor links (tables to process). Starting at table {min_table}.")
+    # Skip tables before the requested starting index
+    return [(idx, text, href) for idx, (text, href) in enumerate(aktien_anchors, start=1) if idx >= min_table]
+
+
+def load_table_for_anchor(driver, idx, anchor_text, anchor_href):
+    """
+    Clicks one 'Aktien' anchor, waits for its table to load and parses it.
+    The anchor is looked up by href in the driver's own DOM, so any driver on the overview page can process it.
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance, on the overview page.
+        idx (int): 1-based table index (for logging).
+        anchor_text (str): Visible anchor text, which is also the table's header.
+        anchor_href (str): Absolute href of the anchor.
+    Returns:
+        list of dict: ETF rows of the table (see parse_tables); empty if the table could not be loaded.
+    """
+    logging.info(f"\nJumping to table {idx}: {anchor_text} ({anchor_href})")
+    draws_before = waits.install_draw_hook(driver)
+    resources_before = None
+    if USE_HTTP_TABLE_FETCH and should_learn_table_endpoint(anchor_text):
+        try:
+            resources_before = driver.execute_script(RESOURCE_COUNT_SCRIPT)
+        except WebDriverException:
+            pass
+    try:
+        if not driver.execute_script(CLICK_ANCHOR_SCRIPT, anchor_href):
+            logging.warning(f"Could not find anchor {anchor_text} on the page")
+            return []
+    except Exception as e:
+        logging.warning(f"Could not click anchor {anchor_text}: {e}")
+        return []
+    # Wait for the table to load: its rows are present and a DataTables draw happened or the row count settled
+    with metrics.span('table_wait', table=anchor_text) as span:
+        try:
+            row_count = waits.wait_until(
+                driver, waits.table_ready(anchor_text, draws_before), waits.TABLE_LOAD, f"table {anchor_text}"
+            )
+            logging.info(f"Table {idx} ready with {row_count} rows (timeout now {waits.TABLE_LOAD.current():.1f}s)")
+        except Exception as e:
+            span['ok'] = False
+            logging.warning(f"Timeout waiting for table '{anchor_text}' to load: {e}")
+            return []
+    # Parse only the current table that was navigated to
+    with metrics.span('parse_tables', table=anchor_text, mode=TABLE_EXTRACTION_MODE) as span:
+        table_rows = parse_tables(driver, expected_table_name=anchor_text)
+        span['rows'] = len(table_rows)
+    if ARCHIVE:
+        ARCHIVE.put(OVERVIEW, anchor_text, driver.page_source, table=idx)
+    if table_rows and resources_before is not None:
+        learn_table_endpoint(driver, anchor_text, resources_before, table_rows, row_count)
+    metrics.observe_peak('browser_rss_bytes', browser_rss_bytes(driver))
+    if table_rows:
+        logging.info(f"Added {len(table_rows)} ETFs from {anchor_text}")
+    return table_rows
+
+
+def should_learn_table_endpoint(anchor_text):
+    """
+    Returns True if the browser path should look for a table's data URL: the table has none stored, and no
+    attempt to learn it failed within TABLE_ENDPOINT_RETRY_HOURS (failed attempts are stored with the
+    endpoints, so the window spans runs).
+    """
+    store = get_table_endpoints()
+    if store.get(anchor_text):
+        return False
+    failed_at = store.failed_at(anchor_text)
+    return failed_at is None or time.time() - failed_at >= TABLE_ENDPOINT_RETRY_HOURS * 3600
+
+
+def learn_table_endpoint(driver, anchor_text, resources_before, table_rows, shown_rows):
+    """
+    Looks for the request that delivered a table's rows among the last TABLE_ENDPOINT_CANDIDATES XHR/fetch
+    requests the page made since resources_before, and stores it for fetch_tables_http. A candidate is only
+    accepted if fetching it over HTTP yields the same ISINs as the browser. A superset is accepted only for a
+    paged data URL whose page the browser showed in full, i.e. the HTTP fetch read the table's other pages too.
+    Probe requests go through REQUEST_BUDGET.
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance, with the table loaded.
+        anchor_text (str): Anchor text of the table.
+        resources_before (int): Number of resource timing entries before the anchor was clicked.
+        table_rows (list of dict): The rows the browser path parsed.
+        shown_rows (int): Number of rows the browser's table showed.
+    """
+    try:
+        candidates = driver.execute_script(NEW_XHR_URLS_SCRIPT, resources_before) or []
+    except WebDriverException:
+        return
+    browser_isins = {etf['isin'] for etf in table_rows}
+    for url in reversed(candidates[-TABLE_ENDPOINT_CANDIDATES:]):
+        try:
+            html = fetch_table_html(url, anchor_text, budget=REQUEST_BUDGET)
+            http_isins = {etf['isin'] for etf in parse_tables_html(html, anchor_text)}
+        except Exception as e:
+            logging.debug(f"Table data candidate {url} failed: {e}")
+            continue
+        if http_isins == browser_isins or (browser_isins < http_isins and shown_rows == page_size(url)):
+            get_table_endpoints().put(anchor_text, url)
+            logging.info(f"Learned data URL of table '{anchor_text}': {url}")
+            return
+    get_table_endpoints().put_failed(anchor_text)
+    logging.info(f"No data URL found for table '{anchor_text}'; not probing it again for "
+                 f"{TABLE_ENDPOINT_RETRY_HOURS} hours.")
+
+
+def fetch_tables_http(anchors, max_tables=MAX_TABLES, journal=None):
+    """
+    Reads the overview tables that have a learned data URL over HTTP, all concurrently, without the browser.
+    A table whose URL fails or yields no rows loses its URL (the browser path learns it again) and is left
+    for the browser, as are tables without URL and journaled tables.
+    Args:
+        anchors (list of tuple): (table index, anchor text, anchor href), as returned by collect_aktien_anchors.
+        max_tables (int): Maximum number of tables to read.
+        journal (ScrapeJournal): Optional run journal; tables read here are recorded.
+    Returns:
+        tuple: (ETF rows read over HTTP ordered by table index, anchors left for the browser,
+            number of tables the browser may still read)
+    """
+    journaled = {anchor for anchor, _ in split_journaled_tables(anchors, journal)[0]}
+    store = get_table_endpoints()
+    todo = [anchor for anchor in anchors if anchor not in journaled and store.get(anchor[1])][:max_tables]
+    if not todo:
+        return [], anchors, max_tables
+    with metrics.span('tables_http', tables=len(todo)) as span:
+        html_by_table = fetch_tables_html({anchor[1]: store.get(anchor[1]) for anchor in todo})
+        etf_rows = []
+        fetched = set()
+        for idx, anchor_text, anchor_href in todo:
+            html = html_by_table.get(anchor_text)
+            table_rows = parse_tables_html(html, expected_table_name=anchor_text) if html else []
+            if not table_rows:
+                logging.warning(f"Table '{anchor_text}' not readable over HTTP; the browser reads it instead.")
+                store.put(anchor_text, None)
+                continue
+            if ARCHIVE:
+                ARCHIVE.put(OVERVIEW, anchor_text, html, table=idx)
+            if journal:
+                journal.record_table(idx, anchor_text, table_rows)
+            etf_rows.extend(table_rows)
+            fetched.add((idx, anchor_text, anchor_href))
+        span['fetched'] = len(fetched)
+    logging.info(f"Read {len(fetched)} of {len(todo)} tables over HTTP ({len(etf_rows)} ETFs).")
+    return etf_rows, [anchor for anchor in anchors if anchor not in fetched], max_tables - len(fetched)
+
+
+def split_journaled_tables(anchors, journal):
+    """
+    Separates tables already recorded in a resumed journal from those still to be loaded.
+    Args:
+        anchors (list of tuple): (table index, anchor text, anchor href).
+        journal (ScrapeJournal): The run journal, or None.
+    Returns:
+        tuple: (list of (anchor, journaled rows), list of anchors to load)
+    """
+    if not journal:
+        return [], anchors
+    done = [(anchor, journal.completed_tables[anchor[0]]) for anchor in anchors if anchor[0] in journal.completed_tables]
+    todo = [anchor for anchor in anchors if anchor[0] not in journal.completed_tables]
+    if done:
+        logging.info(f"Skipping {len(done)} tables already recorded in the journal.")
+    return done, todo
+
+
+def parse_all_tables_by_anchors(driver, max_tables=MAX_TABLES, min_table=MIN_TABLE, journal=None, anchors=None):
     """
     Iterates over all 'Aktien' table anchor links from JustETF website, clicks each anchor,
     waits for the table to load, and parses only the current table that was navigated to.
@@ -221,162 +624,458 @@ def parse_all_tables_by_anchors(driver, max_tables=MAX_TABLES, min_table=MIN_TAB
         driver (webdriver.Chrome): The Selenium WebDriver instance.
         max_tables (int): Maximum number of tables to process. Defaults to MAX_TABLES.
         min_table (int): 1-based index of the first table to start processing. Defaults to MIN_TABLE.
+        journal (ScrapeJournal): Optional run journal; parsed tables are recorded, journaled ones are not reloaded.
+        anchors (list of tuple): Anchors to process. Defaults to collect_aktien_anchors(driver, min_table).
     
     Returns:
         list of dict: Aggregated list of ETF data dictionaries from all processed tables.
         Each dict contains ETF data (name, ter, ytd, etc.) and the table name it came from.
     """
     etf_rows = []
-    anchors = driver.find_elements(By.CSS_SELECTOR, 'a[href*="aktien"]' and 'a[class="light-link"]')
     processed_tables = 0
-    aktien_anchors = [(a, a.text.strip(), a.get_attribute('href')) for a in anchors if "aktien" in a.get_attribute('href').lower()]
-    logging.info(f"Found {len(aktien_anchors)} 'Aktien' table anchor links (tables to process). Starting at table {min_table}.")
-    # Skip tables before the requested starting index
-    if min_table > 1:
-        aktien_anchors = aktien_anchors[min_table - 1:]
-
-    for idx, (anchor, anchor_text, anchor_href) in enumerate(aktien_anchors, start=min_table):
+    if anchors is None:
+        anchors = collect_aktien_anchors(driver, min_table=min_table)
+    journaled = dict(split_journaled_tables(anchors, journal)[0])
+    for idx, anchor_text, anchor_href in anchors:
         if processed_tables >= max_tables:
             break
-        logging.info(f"\nJumping to table {idx}: {anchor_text} ({anchor_href})")
-        try:
-            driver.execute_script("arguments[0].click();", anchor)
-        except Exception as e:
-            logging.warning(f"Could not click anchor {anchor_text}: {e}")
-            continue
-        # Wait for the table to load (wait for h3 header to change or table to appear)
-        try:
-            # Generate fresh random timeouts for this table
-            page_timeout = get_random_timeout()
-            wait_timeout = get_random_timeout()
-            driver.set_page_load_timeout(page_timeout)
-            logging.info(
-                f"Dynamic timeouts for table {idx}: PAGE_LOAD_TIMEOUT={page_timeout}s, "
-                f"ELEMENT_WAIT_TIMEOUT={wait_timeout}s"
-            )
-            WebDriverWait(driver, wait_timeout).until(
-                lambda d: anchor_text in d.page_source
-            )
-            time.sleep(1.5)  # Give extra time for table to render
-        except Exception as e:
-            logging.warning(f"Timeout waiting for table '{anchor_text}' to load: {e}")
-            continue
-        # Parse only the current table that was navigated to
-        table_rows = parse_tables(driver, expected_table_name=anchor_text, timeout=wait_timeout)
+        table_rows = journaled.get((idx, anchor_text, anchor_href))
+        if table_rows is None:
+            table_rows = load_table_for_anchor(driver, idx, anchor_text, anchor_href)
+            if table_rows and journal:
+                journal.record_table(idx, anchor_text, table_rows)
         if table_rows:
             etf_rows.extend(table_rows)
             processed_tables += 1
-            logging.info(f"Added {len(table_rows)} ETFs from {anchor_text}")
-            # Log Dividendenrendite values for each ETF
-            for etf in table_rows:
-                div_rendite = etf.get('dividendenrendite', '')
-                logging.info(f"ETF '{etf['name']}': Dividendenrendite = {div_rendite}")
     logging.info(f"Total tables processed: {processed_tables}")
     logging.info(f"Total ETFs found: {len(etf_rows)}")
     return etf_rows
 
-def scrape_etf_links():
+
+def parse_all_tables_with_pool(anchors, pool_size=BROWSER_POOL_SIZE, max_tables=MAX_TABLES, journal=None):
+    """
+    Same as parse_all_tables_by_anchors, but shards the tables across a pool of headless drivers.
+    Each driver is warmed up on the overview page (cookie banner accepted) and takes anchors from a
+    shared queue; crashed drivers are replaced and their table is retried.
+    Args:
+        anchors (list of tuple): (table index, anchor text, anchor href), as returned by collect_aktien_anchors.
+        pool_size (int): Number of drivers. Defaults to BROWSER_POOL_SIZE.
+        max_tables (int): Stop handing out tables once this many returned rows. Defaults to MAX_TABLES.
+        journal (ScrapeJournal): Optional run journal; parsed tables are recorded, journaled ones are not reloaded.
+    Returns:
+        list of dict: Aggregated ETF rows, ordered by table index.
+    """
+    journaled, anchors = split_journaled_tables(anchors, journal)
+    journaled = [(anchor, rows) for anchor, rows in journaled if rows]
+    processed = [anchor for anchor, _ in journaled]
+    processed_lock = threading.Lock()
+
+    def handle_anchor(driver, anchor):
+        table_rows = load_table_for_anchor(driver, *anchor)
+        if table_rows:
+            if journal:
+                journal.record_table(anchor[0], anchor[1], table_rows)
+            with processed_lock:
+                processed.append(anchor)
+        return table_rows
+
+    def enough_tables():
+        with processed_lock:
+            return len(processed) >= max_tables
+
+    pool = DriverPool(pool_size, create_driver=lambda: setup_driver(headless=True), warm_up=open_overview)
+    results = pool.run(anchors, handle_anchor, should_stop=enough_tables) if not enough_tables() else []
+    # Several drivers may finish a table concurrently; keep the first max_tables tables by index
+    results = sorted(journaled + [r for r in results if r[1]], key=lambda r: r[0][0])[:max_tables]
+    etf_rows = [etf for _, table_rows in results for etf in table_rows]
+    logging.info(f"Total tables processed: {len(results)} on {pool.size} drivers")
+    logging.info(f"Total ETFs found: {len(etf_rows)}")
+    return etf_rows
+
+def extract_factsheet_url(html):
+    """
+    Finds the "Factsheet (DE)" download link in static profile page HTML.
+    Only <a> tags are parsed, which keeps this cheap even for large pages.
+    Args:
+        html (str): Raw HTML of an ETF profile page.
+    Returns:
+        str or None: The absolute factsheet URL, or None if the HTML contains no such link.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('a', class_='download-link'))
+    for link in soup.find_all('a'):
+        if link.get('title') == FACTSHEET_LINK_TITLE and FACTSHEET_LINK_TITLE in link.get_text(" ", strip=True):
+            href = link.get('href')
+            if href:
+                return BASE_URL + href if href.startswith('/') else href
+    return None
+
+
+def fetch_factsheet_url_http(profile_url):
+    """
+    Fetches an ETF profile page with the pooled HTTP session and extracts its factsheet link.
+    Args:
+        profile_url (str): Absolute URL of the ETF profile page.
+    Returns:
+        str or None: The factsheet URL, or None if the request failed or the static HTML has no link.
+    """
+    if REQUEST_BUDGET is not None:
+        REQUEST_BUDGET.acquire(profile_url)
+    try:
+        response = get_http_session().get(profile_url, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+    except Exception as e:
+        logging.warning(f"HTTP fetch of profile page {profile_url} failed: {e}")
+        return None
+    if ARCHIVE:
+        ARCHIVE.put(PROFILE, profile_url, response.text)
+    return extract_factsheet_url(response.text)
+
+
+def find_factsheet_url(driver, profile_url):
+    """
+    Returns the absolute URL of an ETF's "Factsheet (DE)" PDF.
+    With USE_HTTP_PROFILE_FETCH the profile page is read over plain HTTP first; the browser
+    only renders the page when the static HTML does not contain the link.
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance used as fallback.
+        profile_url (str): Absolute URL of the ETF profile page.
+    Returns:
+        str or None: The factsheet URL, or None if the page has no factsheet link.
+    """
+    if USE_HTTP_PROFILE_FETCH:
+        factsheet_url = fetch_factsheet_url_http(profile_url)
+        if factsheet_url:
+            return factsheet_url
+        logging.info("No factsheet link in static profile HTML; falling back to the browser.")
+    return find_factsheet_url_with_driver(driver, profile_url)
+
+
+def find_factsheet_url_with_driver(driver, profile_url):
+    """
+    Loads an ETF profile page in the browser and returns the absolute URL of its "Factsheet (DE)" PDF.
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance.
+        profile_url (str): Absolute URL of the ETF profile page.
+    Returns:
+        str or None: The factsheet URL, or None if the page has no factsheet link.
+    """
+    if REQUEST_BUDGET is not None:
+        REQUEST_BUDGET.acquire(profile_url)
+    with metrics.span('page_load', page='profile'):
+        waits.load_page(driver, profile_url)
+    # Wait for a known element on the profile page to ensure it's loaded
+    logging.info("Waiting for ETF profile page to load (e.g., for an h1 tag)...")
+    try:
+        waits.wait_until(driver, EC.presence_of_element_located((By.TAG_NAME, "h1")), waits.PROFILE_LOAD)
+        logging.info("ETF profile page loaded (h1 found).")
+    except TimeoutException:
+        logging.error("Timed out waiting for ETF profile page content (h1). Proceeding to find factsheet anyway.")
+    if ARCHIVE:
+        # The rendered DOM, which replaces the static HTML recorded by fetch_factsheet_url_http
+        ARCHIVE.put(PROFILE, profile_url, driver.page_source)
+
+    # Find the "Factsheet (DE)" link on the profile page
+    factsheet_link_xpath = "//a[contains(@class, 'download-link') and @title='Factsheet (DE)' and contains(normalize-space(), 'Factsheet (DE)')]"
+    logging.info(f"Looking for Factsheet link with XPath: {factsheet_link_xpath}")
+    try:
+        # Look for the factsheet link but give up quickly to keep the crawl moving.
+        factsheet_anchor = waits.wait_until(
+            driver, EC.presence_of_element_located((By.XPATH, factsheet_link_xpath)), waits.FACTSHEET_LINK
+        )
+        factsheet_href = factsheet_anchor.get_attribute('href')
+    except TimeoutException:
+        logging.info("No 'Factsheet (DE)' link found on this ETF profile; skipping factsheet download.")
+        return None
+    except Exception as e:
+        logging.error(f"An error occurred while trying to find/navigate to the Factsheet link: {e}")
+        return None
+    if not factsheet_href:
+        return None
+    return BASE_URL + factsheet_href if factsheet_href.startswith('/') else factsheet_href
+
+
+def dedupe_by_isin(etf_rows):
+    """
+    Drops repeated ISINs (an ETF can be listed in several tables), keeping the first occurrence.
+    Args:
+        etf_rows (list of dict): ETF rows from the overview tables.
+    Returns:
+        list of dict: The rows with every ISIN at most once; rows without ISIN are kept.
+    """
+    seen = set()
+    unique_rows = []
+    for etf in etf_rows:
+        isin = etf.get('isin')
+        if isin:
+            if isin in seen:
+                continue
+            seen.add(isin)
+        unique_rows.append(etf)
+    if len(unique_rows) < len(etf_rows):
+        logging.info(f"Skipped {len(etf_rows) - len(unique_rows)} duplicate ISINs listed in several tables.")
+    return unique_rows
+
+
+def select_factsheet_work(etf_rows, freshness, max_age_days=FACTSHEET_MAX_AGE_DAYS, now=None):
+    """
+    Splits ETF rows into those whose factsheet must be read and those whose stored value is still fresh.
+    A factsheet is read when the ISIN is new, one of FACTSHEET_RELEVANT_FIELDS changed, no Dividendenrendite
+    is stored, or the last factsheet check is older than max_age_days. All rows get their stored
+    Dividendenrendite copied over, so a failed re-read does not clear it.
+    Args:
+        etf_rows (list of dict): ETF rows from the overview tables.
+        freshness (dict): ISIN -> stored row, as returned by load_freshness.
+        max_age_days (int): Maximum age of a factsheet check. Defaults to FACTSHEET_MAX_AGE_DAYS.
+        now (datetime): Reference time (UTC). Defaults to the current time.
+    Returns:
+        tuple: (rows needing a factsheet read, rows reusing the stored value)
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=max_age_days)
+    if cutoff.tzinfo is None:
+        cutoff = cutoff.replace(tzinfo=timezone.utc)
+    to_scrape, fresh = [], []
+    for etf in etf_rows:
+        stored = freshness.get(etf.get('isin'))
+        checked_at = stored.get('factsheet_checked_at') if stored else None
+        if checked_at is not None and checked_at.tzinfo is None:
+            # SQLite and timestamp columns without time zone return naive values; they are stored as UTC
+            checked_at = checked_at.replace(tzinfo=timezone.utc)
+        if (
+            stored is None
+            or not stored.get('dividendenrendite')
+            or checked_at is None
+            or checked_at < cutoff
+            or any(etf.get(field, '') != (stored.get(field) or '') for field in FACTSHEET_RELEVANT_FIELDS)
+        ):
+            if stored and stored.get('dividendenrendite'):
+                # Kept if the new read fails
+                etf['dividendenrendite'] = stored['dividendenrendite']
+            to_scrape.append(etf)
+        else:
+            etf['dividendenrendite'] = stored['dividendenrendite']
+            fresh.append(etf)
+    return to_scrape, fresh
+
+
+def iter_etf_records(driver, etf_rows, factsheet_rows, journal=None):
+    """
+    Yields ETF records as soon as they are complete.
+    Rows that need no factsheet read come first; the others go through link discovery and the
+    download/extraction pipeline and are yielded as their results arrive, in completion order.
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance (browser fallback for link discovery).
+        etf_rows (list of dict): All ETF rows of the run.
+        factsheet_rows (list of dict): The subset of etf_rows whose factsheet must be read.
+        journal (ScrapeJournal): Optional run journal for factsheet results. Only factsheets that were read
+            (or ETFs without profile page) are journaled and get factsheet_checked_at; failed downloads and
+            extractions and missing factsheet links keep the stored value and are read again by a resumed run.
+    Yields:
+        dict: ETF data dict including 'dividendenrendite'.
+    """
+    factsheet_ids = {id(etf) for etf in factsheet_rows}
+    for etf in etf_rows:
+        if id(etf) not in factsheet_ids:
+            yield etf
+
+    factsheet_checked_at = datetime.now(timezone.utc)
+    results = queue.Queue()
+
+    def on_result(etf, ok):
+        # The consumer below waits for exactly one result per submitted ETF, whatever the journal does
+        try:
+            if ok:
+                etf['factsheet_checked_at'] = factsheet_checked_at
+                if journal:
+                    journal.record_factsheet(etf)
+        finally:
+            results.put(etf)
+
+    def finish_without_factsheet(etf, final):
+        # Not final: nothing was read, so a stored value is kept and the check time is not advanced
+        if final:
+            etf['dividendenrendite'] = ''
+            etf['factsheet_checked_at'] = factsheet_checked_at
+            if journal:
+                journal.record_factsheet(etf)
+        else:
+            etf.setdefault('dividendenrendite', '')
+        return etf
+
+    # Discovery stays on this thread (it drives the browser); downloads and PDF parsing overlap with it.
+    factsheet_cache = FactsheetCache() if USE_FACTSHEET_CACHE else None
+    outstanding = 0
+    try:
+        with FactsheetPipeline(download_workers=DOWNLOAD_WORKERS, extract_workers=EXTRACT_WORKERS,
+                               queue_size=QUEUE_SIZE, cache=factsheet_cache, on_result=on_result,
+                               archive=ARCHIVE) as pipeline:
+            for idx, etf in enumerate(factsheet_rows, 1):
+                profile_url = etf.get('profile_url')
+                if not profile_url:
+                    yield finish_without_factsheet(etf, final=True)
+                    continue
+                logging.info(f"\nProcessing ETF {idx}: {etf['name']} ({profile_url})")
+                with metrics.span('profile_load', isin=etf.get('isin')) as span:
+                    factsheet_url = find_factsheet_url(driver, profile_url)
+                    span['found'] = bool(factsheet_url)
+                if factsheet_url:
+                    logging.info(f"Found Factsheet link: {factsheet_url}. Queueing PDF download...")
+                    pipeline.submit(etf, factsheet_url)
+                    outstanding += 1
+                else:
+                    logging.info(f"ETF {idx}: No factsheet link found")
+                    # The profile page may just have failed to load; a resumed run looks again
+                    yield finish_without_factsheet(etf, final=False)
+                # Hand over whatever finished in the meantime
+                while True:
+                    try:
+                        finished = results.get_nowait()
+                    except queue.Empty:
+                        break
+                    outstanding -= 1
+                    yield finished
+            while outstanding:
+                outstanding -= 1
+                yield results.get()
+    finally:
+        if factsheet_cache:
+            factsheet_cache.close()
+
+
+def _replay_table(archive_dir, anchor_text):
+    """Runs in a replay worker process: parses the Ausschütt rows of one archived overview table."""
+    html = open_replay_archive(archive_dir).get_text(OVERVIEW, anchor_text)
+    return parse_tables_html(html, expected_table_name=anchor_text) if html else []
+
+
+def _replay_factsheet_url(archive_dir, profile_url):
+    """Runs in a replay worker process: finds the factsheet link in an archived profile page."""
+    html = open_replay_archive(archive_dir).get_text(PROFILE, profile_url)
+    return extract_factsheet_url(html) if html else None
+
+
+def replay_archive(archive_dir=ARCHIVE_DIR, workers=EXTRACT_WORKERS, db_url=None):
     """
-    Main scraping function. Iterates over all table anchors, collects Ausschütt ETF rows, downloads their factsheets, extracts Dividendenrendite, and saves all data to a .txt file.
+    Runs table parsing, factsheet extraction and the database write on a recorded run (see --record),
+    without network or browser. Overview tables and profile pages are parsed in a process pool; factsheets
+    go through the FactsheetPipeline, which reads them from the archive. ETFs whose profile page was not
+    recorded (e.g. rows that were still fresh in an incremental run) are not written, so their stored
+    Dividendenrendite is kept. Records carry the timestamps of the recording.
+    Args:
+        archive_dir (str): Directory of the archive.
+        workers (int): Parser processes, also used as the number of extractor processes.
+        db_url (str): SQLAlchemy database URL. Defaults to supabase_url().
+    Returns:
+        int: Number of records written.
+    """
+    from write_to_db import BatchWriter, supabase_url
+
+    archive = ScrapeArchive(archive_dir, replay=True)
+    tables = sorted(archive.entries(OVERVIEW), key=lambda entry: entry.meta.get('table', 0))
+    log_queue = metrics.log_queue()
+    pool_options = {'initializer': metrics.init_worker_logging, 'initargs': (log_queue,)} if log_queue else {}
+    try:
+        with ProcessPoolExecutor(max_workers=workers, **pool_options) as executor:
+            with metrics.span('replay_tables', tables=len(tables)):
+                table_rows = list(executor.map(_replay_table, repeat(archive_dir), [entry.key for entry in tables]))
+            etf_rows = []
+            for entry, rows in zip(tables, table_rows):
+                for etf in rows:
+                    etf['last_scraped_at'] = datetime.fromtimestamp(entry.recorded_at, timezone.utc)
+                etf_rows.extend(rows)
+            etf_rows = dedupe_by_isin(etf_rows)
+            profiles = {etf['profile_url']: archive.entry(PROFILE, etf['profile_url']) for etf in etf_rows}
+            skipped = sum(1 for etf in etf_rows if not profiles[etf['profile_url']])
+            etf_rows = [etf for etf in etf_rows if profiles[etf['profile_url']]]
+            logging.info(f"Replaying {len(etf_rows)} ETFs from {archive_dir} ({skipped} without recorded profile).")
+            with metrics.span('replay_profiles', profiles=len(etf_rows)):
+                factsheet_urls = list(executor.map(
+                    _replay_factsheet_url, repeat(archive_dir), [etf['profile_url'] for etf in etf_rows], chunksize=16
+                ))
+
+        with BatchWriter(db_url or supabase_url()) as writer:
+            with FactsheetPipeline(download_workers=DOWNLOAD_WORKERS, extract_workers=workers, queue_size=QUEUE_SIZE,
+                                   on_result=lambda etf, ok: writer.put(etf), archive=archive) as pipeline:
+                for etf, factsheet_url in zip(etf_rows, factsheet_urls):
+                    recorded_at = profiles[etf['profile_url']].recorded_at
+                    etf['factsheet_checked_at'] = datetime.fromtimestamp(recorded_at, timezone.utc)
+                    if factsheet_url:
+                        pipeline.submit(etf, factsheet_url)
+                    else:
+                        etf['dividendenrendite'] = ''
+                        writer.put(etf)
+        logging.info(f"Replay finished: {writer.written} records written, {writer.failed} failed.")
+        return writer.written
+    finally:
+        archive.close()
+
+
+def scrape_etf_links(incremental=INCREMENTAL_MODE, resume=False):
+    """
+    Main scraping function. Iterates over all table anchors, collects Ausschütt ETF rows, downloads their factsheets, extracts Dividendenrendite, and streams the records into the database as they complete.
+    Args:
+        incremental (bool): Only read factsheets of new, changed or stale ISINs; the stored state is loaded
+            from the database in one query up front. Defaults to INCREMENTAL_MODE.
+        resume (bool): Continue an interrupted run from the journal (JOURNAL_PATH): journaled tables and
+            factsheet results are reused instead of being scraped again.
+    Logging is set up here if the caller has not done so (see metrics.setup_logging); a caller that
+    exits right after should stop the returned listener to flush the last records.
     Returns:
         None
     """
+    metrics.setup_logging()
     driver = setup_driver()
     if not driver:
         return "WebDriver setup failed."
 
+    # Every parsed table and factsheet result is journaled immediately, so a crash loses no finished work
+    journal = ScrapeJournal(resume=resume)
     try:
-        logging.info(f"Fetching data from {URL}...")
-        driver.get(URL)
-
-        # Handle Cookie Consent Pop-up
-        try:
-            cookie_button_xpath = f"//button[normalize-space()='{COOKIE_BUTTON_TEXT}']"
-            logging.info(f"Waiting for cookie consent button: '{COOKIE_BUTTON_TEXT}'...")
-            cookie_button = WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
-                EC.element_to_be_clickable((By.XPATH, cookie_button_xpath))
-            )
-            logging.info("Cookie button found. Clicking...")
-            cookie_button.click()
-            logging.info("Clicked cookie button. Pausing for page to settle...")
-            time.sleep(3)
-        except TimeoutException:
-            logging.warning(f"Cookie button '{COOKIE_BUTTON_TEXT}' not found. Proceeding...")
-        except Exception as e:
-            logging.error(f"Error clicking cookie button: {e}. Proceeding...")
+        if not open_overview(driver):
+            return
 
-        logging.info("Waiting for page content to stabilize after navigation/cookie handling...")
-        time.sleep(5)
-        
-        # Instead of scrolling, iterate over all table anchors and parse each table
-        etf_rows = parse_all_tables_by_anchors(driver, max_tables=MAX_TABLES, min_table=MIN_TABLE)
+        # Instead of scrolling, iterate over all table anchors and parse each table: over HTTP where the
+        # table's data URL is known, in the browser otherwise
+        anchors = collect_aktien_anchors(driver, min_table=MIN_TABLE)
+        etf_rows, max_tables = [], MAX_TABLES
+        if USE_HTTP_TABLE_FETCH:
+            etf_rows, anchors, max_tables = fetch_tables_http(anchors, max_tables=MAX_TABLES, journal=journal)
+        if anchors and max_tables > 0:
+            if BROWSER_POOL_SIZE > 1:
+                etf_rows += parse_all_tables_with_pool(anchors, pool_size=BROWSER_POOL_SIZE, max_tables=max_tables,
+                                                       journal=journal)
+            else:
+                etf_rows += parse_all_tables_by_anchors(driver, max_tables=max_tables, journal=journal, anchors=anchors)
         if not etf_rows:
             print("No Ausschütt ETFs found in tables.")
             return
+        etf_rows = dedupe_by_isin(etf_rows)
 
-        # Step 2: For each ETF, extract Dividendenrendite from factsheet if possible
-        for idx, etf in enumerate(etf_rows, 1):
-            profile_url = etf.get('profile_url')
-            if not profile_url:
-                etf['dividendenrendite'] = ''
-                continue
-            logging.info(f"\nProcessing ETF {idx}: {etf['name']} ({profile_url})")
-            driver.get(profile_url)
-            # Wait for a known element on the profile page to ensure it's loaded
-            logging.info("Waiting for ETF profile page to load (e.g., for an h1 tag)...")
-            try:
-                WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "h1"))
-                )
-                logging.info("ETF profile page loaded (h1 found).")
-            except TimeoutException:
-                logging.error("Timed out waiting for ETF profile page content (h1). Proceeding to find factsheet anyway.")
-
-            # Step 2: Find the "Factsheet (DE)" link on the profile page
-            factsheet_link_xpath = "//a[contains(@class, 'download-link') and @title='Factsheet (DE)' and contains(normalize-space(), 'Factsheet (DE)')]"
-            logging.info(f"Looking for Factsheet link with XPath: {factsheet_link_xpath}")
-            try:
-                # Look for the factsheet link but give up quickly (5 s) to keep the crawl moving.
-                factsheet_anchor = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, factsheet_link_xpath))
-                )
-                factsheet_href = factsheet_anchor.get_attribute('href')
-                if factsheet_href:
-                    if factsheet_href.startswith('/'):
-                        factsheet_href_abs = BASE_URL + factsheet_href
-                    else:
-                        factsheet_href_abs = factsheet_href
-                    logging.info(f"Found Factsheet link: {factsheet_href_abs}. Downloading PDF...")
-                    pdf_path = download_pdf(factsheet_href_abs)
-                    if pdf_path:
-                        div_rendite = extract_dividendenrendite_from_pdf(pdf_path)
-                        if div_rendite:
-                            etf['dividendenrendite'] = div_rendite
-                            logging.info(f"ETF {idx}: Dividendenrendite found: {div_rendite}")
-                        else:
-                            etf['dividendenrendite'] = ''
-                            logging.info(f"ETF {idx}: No Dividendenrendite found in PDF")
-                        os.remove(pdf_path)
-                    else:
-                        etf['dividendenrendite'] = ''
-                        logging.info(f"ETF {idx}: Could not download PDF")
-                else:
-                    etf['dividendenrendite'] = ''
-                    logging.info(f"ETF {idx}: No factsheet link found")
-            except TimeoutException:
-                logging.info("No 'Factsheet (DE)' link found within 5 s on this ETF profile; skipping factsheet download.")
-                etf['dividendenrendite'] = ''
-            except Exception as e:
-                logging.error(f"An error occurred while trying to find/navigate to the Factsheet link: {e}")
-                etf['dividendenrendite'] = ''
+        factsheet_rows = etf_rows
+        if incremental:
+            from write_to_db import load_freshness, supabase_url
+
+            freshness = load_freshness(supabase_url())
+            factsheet_rows, fresh_rows = select_factsheet_work(etf_rows, freshness)
+            logging.info(
+                f"Incremental mode: {len(factsheet_rows)} factsheets to read, {len(fresh_rows)} ETFs still fresh."
+            )
+        if journal.factsheets:
+            resumed_rows = [etf for etf in factsheet_rows if journal.apply_factsheet(etf)]
+            factsheet_rows = [etf for etf in factsheet_rows if etf.get('isin') not in journal.factsheets]
+            logging.info(f"Reusing {len(resumed_rows)} factsheet results from the journal.")
 
-        # Log final Dividendenrendite values before database insertion
-        logging.info("\nFinal Dividendenrendite values for all ETFs:")
-        for etf in etf_rows:
-            logging.info(f"ETF '{etf['name']}': Dividendenrendite = {etf.get('dividendenrendite', '')}")
+        # Steps 2 + 3: records stream into the database while the remaining factsheets are still being processed
+        from write_to_db import BatchWriter, supabase_url
 
-        # Step 3: Insert all ETF data into database
-        insert_etf_entries(etf_rows, SUPABASE_URL)
+        with BatchWriter(supabase_url()) as writer:
+            for etf in iter_etf_records(driver, etf_rows, factsheet_rows, journal):
+                writer.put(etf)
+        logging.info(f"Database writer finished: {writer.written} records written, {writer.failed} failed.")
+        if writer.failed == 0:
+            journal.mark_complete()
 
     except WebDriverException as e:
         logging.error(f"Selenium WebDriver error: {e}")
@@ -385,10 +1084,47 @@ def scrape_etf_links():
         logging.error(f"Unexpected error: {e}")
         print(f"Unexpected error: {e}")
     finally:
+        journal.close()
         if driver:
             logging.info("Closing WebDriver.")
             driver.quit()
 
 if __name__ == "__main__":
-    scrape_etf_links()
+    parser = argparse.ArgumentParser(description="Scrape distributing ETFs from justetf.com into the database.")
+    parser.add_argument('--incremental', action='store_true', default=INCREMENTAL_MODE,
+                        help="only read factsheets of new, changed or stale ISINs")
+    parser.add_argument('--resume', action='store_true',
+                        help=f"continue an interrupted run from {JOURNAL_PATH}, skipping completed work")
+    parser.add_argument('--offline-driver', action='store_true', default=chromedriver.OFFLINE,
+                        help="never resolve chromedriver online; use the cached path, CHROMEDRIVER_PATH or PATH")
+    parser.add_argument('--record', metavar='DIR', nargs='?', const=ARCHIVE_DIR,
+                        help=f"record every fetched page and factsheet into a local archive (default {ARCHIVE_DIR})")
+    parser.add_argument('--replay', metavar='DIR', nargs='?', const=ARCHIVE_DIR,
+                        help="re-run parsing, extraction and the database write from a recorded archive, offline")
+    parser.add_argument('--full-browser', action='store_true',
+                        help="run Chrome with a window and load every resource (for debugging the page)")
+    parser.add_argument('--report', default=metrics.REPORT_PATH,
+                        help="write the end-of-run timing summary as JSON to this file")
+    parser.add_argument('--prometheus',
+                        help="also write the summary in Prometheus text format to this file (textfile collector)")
+    args = parser.parse_args()
+    chromedriver.OFFLINE = args.offline_driver
+    if args.full_browser:
+        LEAN_DRIVER = False
+    if args.record:
+        ARCHIVE = ScrapeArchive(args.record)
+    log_listener = metrics.setup_logging()
+    try:
+        if args.replay:
+            replay_archive(args.replay)
+        else:
+            scrape_etf_links(incremental=args.incremental, resume=args.resume)
+    finally:
+        if ARCHIVE:
+            ARCHIVE.close()
+        metrics.RUN.log_summary()
+        metrics.RUN.write_report(args.report)
+        if args.prometheus:
+            metrics.RUN.write_prometheus(args.prometheus)
+        log_listener.stop()
 
@@ -0,0 +1,53 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from etf_values import parse_german_number, parse_percent, parse_fund_size, parse_german_date
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("1.234,56", Decimal("1234.56")),
+    ("-3,2", Decimal("-3.2")),
+    ("−0,5", Decimal("-0.5")),
+    ("4.217", Decimal("4217")),
+    ("12", Decimal("12")),
+])
+def test_parse_german_number(text, expected):
+    assert parse_german_number(text) == expected
+
+
+@pytest.mark.parametrize('text', [None, "", "-", "n/a", "k. A.", "no DivRendite found", "keine Angabe"])
+def test_sentinels_and_texts_without_number_are_none(text):
+    assert parse_german_number(text) is None
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("2,02%", Decimal("2.02")),
+    ("0,2 %", Decimal("0.2")),
+    ("4.06%", Decimal("4.06")),  # English notation in factsheets
+    ("no DivRendite found", None),
+])
+def test_parse_percent(text, expected):
+    assert parse_percent(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("4.217", Decimal("4217")),
+    ("1.234 Mio. €", Decimal("1234")),
+    ("1,2 Mrd. €", Decimal("1200.0")),
+    ("500 Tsd. EUR", Decimal("0.500")),
+    ("-", None),
+])
+def test_parse_fund_size(text, expected):
+    assert parse_fund_size(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("03.09.2012", date(2012, 9, 3)),
+    ("aufgelegt am 1.2.2020", date(2020, 2, 1)),
+    ("31.02.2020", None),
+    ("-", None),
+])
+def test_parse_german_date(text, expected):
+    assert parse_german_date(text) == expected
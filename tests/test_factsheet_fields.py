@@ -0,0 +1,70 @@
+from factsheet_fields import FieldScanner, FieldSpec, NO_DIVIDENDENRENDITE, PERCENT_PATTERN
+
+# Specs of fields production does not read, to exercise the multi-field and list scanning
+TER = FieldSpec('ter', [r"Gesamtkostenquote", r"\bTER\b"], PERCENT_PATTERN)
+FONDSVOLUMEN = FieldSpec('fondsvolumen', [r"Fondsvolumen"], r"(\d{1,3}(?:\.\d{3})*(?:,\d+)?\s*Mio\.?(?:\s*EUR)?)")
+TOP_POSITIONEN = FieldSpec(
+    'top_positionen', [r"Top[ -]?10[ -]Positionen"], r"^(.*\S\s+\d{1,3}[.,]\d{1,3}\s*%)\s*$",
+    next_line=False, fallback=False, default=(), collect=10,
+)
+
+
+def scan(lines, fields=None, full_text=None):
+    scanner = FieldScanner(fields)
+    for line in lines:
+        if scanner.feed(line):
+            break
+    return scanner.results(lambda: full_text if full_text is not None else "\n".join(lines))
+
+
+def test_value_on_the_same_line():
+    assert scan(["Fondsdaten", "Dividendenrendite 2,02%"], ['dividendenrendite']) == {'dividendenrendite': '2,02%'}
+
+
+def test_value_on_the_next_line():
+    assert scan(["Dividendenrendite", "3,1 %"], ['dividendenrendite'])['dividendenrendite'] == '3,1 %'
+
+
+def test_higher_priority_keyword_wins_over_earlier_lower_one():
+    lines = ["Rendite p.a. 5,00%", "Dividende 1,50%", "Dividendenrendite 2,00%"]
+    assert scan(lines, ['dividendenrendite'])['dividendenrendite'] == '2,00%'
+
+
+def test_lower_priority_keyword_is_used_if_nothing_better_is_found():
+    assert scan(["Rendite p.a. 5,00%"], ['dividendenrendite'])['dividendenrendite'] == '5,00%'
+
+
+def test_defaults_when_nothing_is_found():
+    results = scan(["Anlageziel und Anlagepolitik"], ['dividendenrendite', TER, TOP_POSITIONEN])
+    assert results == {'dividendenrendite': NO_DIVIDENDENRENDITE, 'ter': None, 'top_positionen': []}
+
+
+def test_only_production_fields_are_registered():
+    assert scan(["Dividendenrendite 1,80%", "Gesamtkostenquote 0,20%"]) == {'dividendenrendite': '1,80%'}
+
+
+def test_several_fields_in_one_pass():
+    lines = ["Gesamtkostenquote (TER) 0,20%", "Fondsvolumen 1.234 Mio. EUR", "Dividendenrendite 1,80%"]
+    results = scan(lines, ['dividendenrendite', TER, FONDSVOLUMEN])
+    assert results == {'dividendenrendite': '1,80%', 'ter': '0,20%', 'fondsvolumen': '1.234 Mio. EUR'}
+
+
+def test_list_field_collects_the_following_lines():
+    lines = ["Top 10 Positionen", "Apple 4,12%", "Microsoft 3,80%", "Länderaufteilung", "USA 62,10%"]
+    assert scan(lines, [TOP_POSITIONEN])['top_positionen'] == ["Apple 4,12%", "Microsoft 3,80%"]
+
+
+def test_feed_reports_done_once_every_field_has_its_top_keyword():
+    scanner = FieldScanner(['dividendenrendite'])
+    assert not scanner.feed("Rendite 1,00%")
+    assert scanner.feed("Dividendenrendite 2,00%")
+
+
+def test_case_sensitive_spec_is_not_matched_in_other_case():
+    spec = FieldSpec('isin_ter', [r"TER"], PERCENT_PATTERN, fallback=False, flags=0)
+    assert scan(["ter 1,00%"], [spec]) == {'isin_ter': None}
+    assert scan(["ter 1,00%", "TER 0,07%"], [spec]) == {'isin_ter': '0,07%'}
+
+
+def test_case_insensitive_spec_matches_any_case():
+    assert scan(["DIVIDENDENRENDITE 2,0%"], ['dividendenrendite'])['dividendenrendite'] == '2,0%'
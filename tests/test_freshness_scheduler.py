@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip('selenium')  # daemon imports the scraper
+
+from daemon import FreshnessScheduler  # noqa: E402
+
+HOUR = 3600
+NOW = 1_000_000.0
+
+
+def etf(isin, name='Fund', dividendenrendite=None):
+    row = {'isin': isin, 'name': name, 'ter': '0,20%', 'ausschüttung': 'Ausschüttend', 'replikation': 'Physisch'}
+    if dividendenrendite is not None:
+        row['dividendenrendite'] = dividendenrendite
+    return row
+
+
+def stored(row, dividendenrendite='2,00%', checked_hours_ago=None):
+    checked = None
+    if checked_hours_ago is not None:
+        checked = datetime.fromtimestamp(NOW - checked_hours_ago * HOUR, timezone.utc)
+    return dict(row, dividendenrendite=dividendenrendite, factsheet_checked_at=checked)
+
+
+def test_new_isins_come_before_stale_ones():
+    scheduler = FreshnessScheduler(min_refresh_hours=24)
+    old, new = etf('IE_OLD'), etf('IE_NEW')
+    scheduler.update([old, new], {'IE_OLD': stored(old, checked_hours_ago=100)}, now=NOW)
+    assert scheduler.next_due(now=NOW)['isin'] == 'IE_NEW'
+    assert scheduler.next_due(now=NOW)['isin'] == 'IE_OLD'
+    assert scheduler.next_due(now=NOW) is None
+
+
+def test_recently_read_factsheets_are_not_due():
+    scheduler = FreshnessScheduler(min_refresh_hours=24)
+    row = etf('IE1')
+    scheduler.update([row], {'IE1': stored(row, checked_hours_ago=2)}, now=NOW)
+    assert scheduler.next_due(now=NOW) is None
+
+
+def test_changed_fields_and_empty_values_are_due():
+    scheduler = FreshnessScheduler(min_refresh_hours=24)
+    changed, empty = etf('IE1', name='Renamed'), etf('IE2')
+    freshness = {
+        'IE1': stored(etf('IE1'), checked_hours_ago=1),
+        'IE2': stored(empty, dividendenrendite='', checked_hours_ago=1),
+    }
+    scheduler.update([changed, empty], freshness, now=NOW)
+    assert {scheduler.next_due(now=NOW)['isin'], scheduler.next_due(now=NOW)['isin']} == {'IE1', 'IE2'}
+
+
+def test_stored_value_is_copied_into_the_scheduled_row():
+    scheduler = FreshnessScheduler()
+    row = etf('IE1')
+    scheduler.update([row], {'IE1': stored(row, dividendenrendite='3,10%', checked_hours_ago=1)}, now=NOW)
+    assert row['dividendenrendite'] == '3,10%'
+
+
+def test_popular_etfs_are_refreshed_first():
+    scheduler = FreshnessScheduler(min_refresh_hours=24, views={'IE_POPULAR': 1000})
+    rows = [etf('IE_QUIET'), etf('IE_POPULAR')]
+    freshness = {
+        'IE_QUIET': stored(rows[0], checked_hours_ago=60),
+        'IE_POPULAR': stored(rows[1], checked_hours_ago=30),
+    }
+    scheduler.update(rows, freshness, now=NOW)
+    assert scheduler.next_due(now=NOW)['isin'] == 'IE_POPULAR'
+
+
+def test_failed_reads_are_retried_with_backoff():
+    scheduler = FreshnessScheduler(min_refresh_hours=24, retry_minutes=10)
+    scheduler.update([etf('IE1')], {}, now=NOW)
+    assert scheduler.next_due(now=NOW)['isin'] == 'IE1'
+    scheduler.mark_failed('IE1', now=NOW)
+    assert scheduler.next_due(now=NOW + 9 * 60) is None
+    assert scheduler.next_due(now=NOW + 10 * 60)['isin'] == 'IE1'
+    scheduler.mark_failed('IE1', now=NOW + 10 * 60)
+    assert scheduler.next_due(now=NOW + 29 * 60) is None
+    assert scheduler.next_due(now=NOW + 30 * 60)['isin'] == 'IE1'
+
+
+def test_handed_out_etf_waits_for_its_outcome_and_read_etf_for_the_min_refresh():
+    scheduler = FreshnessScheduler(min_refresh_hours=24)
+    scheduler.update([etf('IE1')], {}, now=NOW)
+    assert scheduler.next_due(now=NOW)['isin'] == 'IE1'
+    assert scheduler.next_due(now=NOW + 1) is None
+    scheduler.mark_read('IE1', now=NOW + 60)
+    assert scheduler.next_due(now=NOW + 23 * HOUR) is None
+    assert scheduler.next_due(now=NOW + 60 + 24 * HOUR)['isin'] == 'IE1'
+
+
+def test_empty_value_read_by_the_daemon_is_not_due_again_on_the_next_update():
+    scheduler = FreshnessScheduler(min_refresh_hours=24)
+    row = etf('IE1')
+    scheduler.update([row], {}, now=NOW)
+    scheduler.next_due(now=NOW)
+    scheduler.mark_read('IE1', now=NOW)
+    row = etf('IE1')
+    scheduler.update([row], {'IE1': stored(row, dividendenrendite='', checked_hours_ago=None)}, now=NOW + HOUR)
+    assert scheduler.next_due(now=NOW + HOUR) is None
@@ -0,0 +1,41 @@
+import threading
+
+import http_client
+from http_client import HostBudget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_one_request_per_interval(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(http_client.time, 'monotonic', clock)
+    budget = HostBudget(requests_per_minute=60, burst=2)
+    assert budget._reserve('example.com') == 0.0
+    assert budget._reserve('example.com') == 0.0
+    assert budget._reserve('example.com') == 1.0
+    clock.now += 0.5
+    assert budget._reserve('example.com') == 0.5
+    clock.now += 0.5
+    assert budget._reserve('example.com') == 0.0
+
+
+def test_hosts_have_separate_budgets(monkeypatch):
+    monkeypatch.setattr(http_client.time, 'monotonic', FakeClock())
+    budget = HostBudget(requests_per_minute=60, burst=1)
+    assert budget.acquire("https://www.justetf.com/de/etf-profile.html")
+    assert budget.acquire("https://cdn.example.com/factsheet.pdf")
+    assert budget._reserve('www.justetf.com') > 0
+
+
+def test_acquire_returns_false_when_stopped_while_waiting():
+    budget = HostBudget(requests_per_minute=1, burst=1)
+    stop = threading.Event()
+    assert budget.acquire("https://www.justetf.com/a", stop)
+    stop.set()
+    assert not budget.acquire("https://www.justetf.com/b", stop)
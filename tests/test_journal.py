@@ -0,0 +1,65 @@
+import json
+from datetime import datetime, timezone
+
+from journal import ScrapeJournal
+
+
+def test_resume_replays_tables_and_factsheets(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    checked_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    journal = ScrapeJournal(path)
+    journal.record_table(1, "Aktien Welt", [{'isin': 'IE0001'}, {'isin': 'IE0002'}])
+    journal.record_factsheet({'isin': 'IE0001', 'dividendenrendite': '2,00%', 'factsheet_checked_at': checked_at})
+    journal.close()
+
+    resumed = ScrapeJournal(path, resume=True)
+    assert resumed.completed_tables == {1: [{'isin': 'IE0001'}, {'isin': 'IE0002'}]}
+    etf = {'isin': 'IE0001'}
+    assert resumed.apply_factsheet(etf)
+    assert etf == {'isin': 'IE0001', 'dividendenrendite': '2,00%', 'factsheet_checked_at': checked_at}
+    assert not resumed.apply_factsheet({'isin': 'IE0002'})
+    resumed.close()
+
+
+def test_table_without_completion_marker_is_not_resumed(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_text(json.dumps({'type': 'row', 'table': 1, 'etf': {'isin': 'IE0001'}}) + "\n", encoding='utf-8')
+    resumed = ScrapeJournal(str(path), resume=True)
+    assert resumed.completed_tables == {}
+    resumed.close()
+
+
+def test_half_written_last_line_is_skipped_and_terminated(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_text(
+        json.dumps({'type': 'factsheet', 'isin': 'IE0001', 'dividendenrendite': '1,00%'}) + "\n"
+        + '{"type": "factsheet", "isin": "IE00',
+        encoding='utf-8',
+    )
+    resumed = ScrapeJournal(str(path), resume=True)
+    assert list(resumed.factsheets) == ['IE0001']
+    resumed.record_factsheet({'isin': 'IE0003', 'dividendenrendite': ''})
+    resumed.close()
+    assert list(ScrapeJournal(str(path), resume=True).factsheets) == ['IE0001', 'IE0003']
+
+
+def test_completed_run_starts_fresh(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = ScrapeJournal(path)
+    journal.record_factsheet({'isin': 'IE0001', 'dividendenrendite': '1,00%'})
+    journal.mark_complete()
+    journal.close()
+
+    resumed = ScrapeJournal(path, resume=True)
+    assert resumed.factsheets == {}
+    assert resumed.completed_tables == {}
+    resumed.close()
+
+
+def test_without_resume_the_journal_is_truncated(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = ScrapeJournal(path)
+    journal.record_factsheet({'isin': 'IE0001', 'dividendenrendite': '1,00%'})
+    journal.close()
+    ScrapeJournal(path).close()
+    assert ScrapeJournal(path, resume=True).factsheets == {}
@@ -0,0 +1,36 @@
+import json
+
+from overview_http import EndpointStore, page_size
+
+
+def test_endpoints_and_failed_attempts_survive_a_restart(tmp_path):
+    path = str(tmp_path / "endpoints.json")
+    store = EndpointStore(path)
+    store.put("Aktien Welt", "https://example.com/data?start=0&length=50")
+    store.put_failed("Aktien Asien", at=1000.0)
+
+    reloaded = EndpointStore(path)
+    assert reloaded.get("Aktien Welt") == "https://example.com/data?start=0&length=50"
+    assert reloaded.failed_at("Aktien Asien") == 1000.0
+    assert reloaded.failed_at("Aktien Welt") is None
+
+
+def test_learning_a_url_clears_the_failed_attempt(tmp_path):
+    store = EndpointStore(str(tmp_path / "endpoints.json"))
+    store.put_failed("Aktien Asien", at=1000.0)
+    store.put("Aktien Asien", "https://example.com/asien")
+    assert store.failed_at("Aktien Asien") is None
+
+
+def test_reads_the_flat_format_of_older_files(tmp_path):
+    path = tmp_path / "endpoints.json"
+    path.write_text(json.dumps({"Aktien Welt": "https://example.com/welt"}), encoding='utf-8')
+    store = EndpointStore(str(path))
+    assert store.get("Aktien Welt") == "https://example.com/welt"
+    assert store.failed_at("Aktien Welt") is None
+
+
+def test_page_size_of_server_side_datatables_urls():
+    assert page_size("https://example.com/data?draw=1&start=0&length=50") == 50
+    assert page_size("https://example.com/data?iDisplayStart=0&iDisplayLength=25") == 25
+    assert page_size("https://example.com/data?isin=IE00") is None
@@ -0,0 +1,69 @@
+import pytest
+
+pytest.importorskip('selenium')
+
+import waits  # noqa: E402
+from waits import AdaptiveTimeout, TIMEOUT_FACTOR, MAX_BACKOFF  # noqa: E402
+
+
+def test_initial_value_until_enough_samples():
+    timeout = AdaptiveTimeout('test', initial=10, minimum=1, maximum=60)
+    timeout.record(1.0)
+    timeout.record(1.0)
+    assert timeout.current() == 10
+
+
+def test_learned_from_p95_of_recent_latencies():
+    timeout = AdaptiveTimeout('test', initial=10, minimum=1, maximum=60)
+    for seconds in (1.0, 2.0, 3.0, 4.0):
+        timeout.record(seconds)
+    assert timeout.current() == 4.0 * TIMEOUT_FACTOR
+
+
+def test_clamped_to_minimum_and_maximum():
+    fast = AdaptiveTimeout('fast', initial=10, minimum=2, maximum=60)
+    slow = AdaptiveTimeout('slow', initial=10, minimum=2, maximum=60)
+    for _ in range(3):
+        fast.record(0.01)
+        slow.record(100.0)
+    assert fast.current() == 2
+    assert slow.current() == 60
+
+
+def test_timeouts_back_off_until_the_next_success():
+    timeout = AdaptiveTimeout('test', initial=10, minimum=1, maximum=1000)
+    timeout.record_timeout()
+    assert timeout.current() == 20
+    for _ in range(5):
+        timeout.record_timeout()
+    assert timeout.current() == 10 * MAX_BACKOFF
+    timeout.record(1.0)
+    assert timeout.current() == 10
+
+
+class FakeDriver:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.page_load_timeouts = []
+
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeouts.append(seconds)
+
+    def get(self, url):
+        if self.fail:
+            raise waits.TimeoutException("page load")
+
+
+def test_load_page_sets_the_learned_timeout_and_records_the_load():
+    timeout = AdaptiveTimeout('page', initial=30, minimum=5, maximum=120)
+    driver = FakeDriver()
+    waits.load_page(driver, "https://example.com", timeout)
+    assert driver.page_load_timeouts == [30]
+    assert len(timeout._latencies) == 1
+
+
+def test_load_page_backs_off_on_timeout():
+    timeout = AdaptiveTimeout('page', initial=30, minimum=5, maximum=120)
+    with pytest.raises(waits.TimeoutException):
+        waits.load_page(FakeDriver(fail=True), "https://example.com", timeout)
+    assert timeout.current() == 60
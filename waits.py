@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+POLL_INTERVAL = 0.2  # Seconds between two polls of a wait condition
+LATENCY_WINDOW = 30  # Recent successful waits a timeout is learned from
+TIMEOUT_FACTOR = 3.0  # Timeout = factor x p95 of the recent latencies
+MAX_BACKOFF = 4.0  # Largest multiplier applied after consecutive timeouts
+
+
+class AdaptiveTimeout:
+    """
+    A timeout learned from recently observed latencies of one kind of wait.
+    Until enough samples exist the initial value is used; afterwards the timeout is TIMEOUT_FACTOR times
+    the p95 of the last LATENCY_WINDOW successful waits, clamped to [minimum, maximum]. Every timeout doubles
+    a backoff multiplier (bounded by MAX_BACKOFF) so a slow phase of the site does not fail every wait;
+    the next success resets it. Shared between threads.
+    """
+
+    def __init__(self, name, initial, minimum, maximum):
+        self.name = name
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._backoff = 1.0
+        self._lock = threading.Lock()
+
+    def current(self):
+        """Returns the timeout in seconds to use for the next wait."""
+        with self._lock:
+            if len(self._latencies) < 3:
+                base = self.initial
+            else:
+                ordered = sorted(self._latencies)
+                p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+                base = p95 * TIMEOUT_FACTOR
+            return min(self.maximum, max(self.minimum, base) * self._backoff)
+
+    def record(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+            self._backoff = 1.0
+
+    def record_timeout(self):
+        with self._lock:
+            self._backoff = min(MAX_BACKOFF, self._backoff * 2)
+
+
+# One learned timeout per kind of wait in the scraper
+PAGE_LOAD = AdaptiveTimeout('page_load', initial=30, minimum=5, maximum=120)
+COOKIE_BANNER = AdaptiveTimeout('cookie_banner', initial=15, minimum=2, maximum=60)
+OVERVIEW_READY = AdaptiveTimeout('overview_ready', initial=30, minimum=3, maximum=120)
+TABLE_LOAD = AdaptiveTimeout('table_load', initial=30, minimum=3, maximum=300)
+PROFILE_LOAD = AdaptiveTimeout('profile_load', initial=15, minimum=2, maximum=60)
+FACTSHEET_LINK = AdaptiveTimeout('factsheet_link', initial=5, minimum=1, maximum=15)
+SCROLL = AdaptiveTimeout('scroll', initial=3, minimum=0.5, maximum=10)
+
+
+def wait_until(driver, condition, timeout, description=None):
+    """
+    Polls condition(driver) every POLL_INTERVAL seconds until it returns a truthy value.
+    The elapsed time feeds the AdaptiveTimeout, a timeout increases its backoff.
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance.
+        condition (callable): Wait condition, e.g. an expected_conditions object or one of the conditions below.
+        timeout (AdaptiveTimeout): The learned timeout for this kind of wait.
+        description (str): Optional text for the log line.
+    Returns:
+        The condition's truthy value.
+    Raises:
+        TimeoutException: If the condition is not met within the current timeout.
+    """
+    limit = timeout.current()
+    start = time.monotonic()
+    try:
+        value = WebDriverWait(driver, limit, poll_frequency=POLL_INTERVAL).until(condition)
+    except TimeoutException:
+        timeout.record_timeout()
+        logging.info(f"Wait '{description or timeout.name}' timed out after {limit:.1f}s")
+        raise
+    timeout.record(time.monotonic() - start)
+    return value
+
+
+
+def load_page(driver, url, timeout=PAGE_LOAD):
+    """
+    Navigates to url with the learned page load timeout (set on the driver before every navigation).
+    The load time feeds the AdaptiveTimeout, a timeout increases its backoff.
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance.
+        url (str): The URL to load.
+        timeout (AdaptiveTimeout): The learned timeout for page loads.
+    Raises:
+        TimeoutException: If the page does not load within the current timeout.
+    """
+    limit = timeout.current()
+    driver.set_page_load_timeout(limit)
+    start = time.monotonic()
+    try:
+        driver.get(url)
+    except TimeoutException:
+        timeout.record_timeout()
+        logging.info(f"Page load of {url} timed out after {limit:.1f}s")
+        raise
+    timeout.record(time.monotonic() - start)
+
+# Counts the rows of the first striped table after the h3 whose text contains arguments[0] (-1: no such table),
+# i.e. the table parse_tables would pick. Runs in the browser, so no page_source serialization per poll.
+TABLE_ROW_COUNT_SCRIPT = """
+const name = arguments[0].toLowerCase();
+let headerFound = false;
+for (const el of document.querySelectorAll('h3, table.table-striped')) {
+    if (el.tagName === 'H3') {
+        if (!headerFound && el.textContent.toLowerCase().includes(name)) { headerFound = true; }
+    } else if (headerFound) {
+        return el.querySelectorAll('tbody > tr').length;
+    }
+}
+return -1;
+"""
+
+# Counts DataTables 'draw' events (jQuery DataTables fires 'draw.dt' on the document when a table renders)
+INSTALL_DRAW_HOOK_SCRIPT = """
+if (!window.__etfDrawHooked && window.jQuery) {
+    window.__etfDraws = 0;
+    window.jQuery(document).on('draw.dt', function () { window.__etfDraws += 1; });
+    window.__etfDrawHooked = true;
+}
+return window.__etfDrawHooked ? window.__etfDraws : null;
+"""
+
+
+def install_draw_hook(driver):
+    """
+    Starts counting DataTables draw events on the current page.
+    Returns:
+        int or None: The draw count so far, or None if the page has no jQuery (row stabilization is used alone).
+    """
+    try:
+        return driver.execute_script(INSTALL_DRAW_HOOK_SCRIPT)
+    except WebDriverException:
+        return None
+
+
+class table_ready:
+    """
+    Wait condition for the table belonging to an anchor: ready once it has rows and either a DataTables
+    draw event happened since draws_before, or its row count stayed the same for stable_polls polls.
+    """
+
+    def __init__(self, table_name, draws_before=None, stable_polls=2):
+        self.table_name = table_name
+        self.draws_before = draws_before
+        self.stable_polls = stable_polls
+        self._last_count = None
+        self._unchanged = 0
+
+    def __call__(self, driver):
+        count = driver.execute_script(TABLE_ROW_COUNT_SCRIPT, self.table_name)
+        if count is None or count <= 0:
+            self._last_count, self._unchanged = count, 0
+            return False
+        if self.draws_before is not None:
+            draws = driver.execute_script("return window.__etfDraws;")
+            if draws is not None and draws > self.draws_before:
+                return count
+        if count == self._last_count:
+            self._unchanged += 1
+        else:
+            self._last_count, self._unchanged = count, 0
+        return count if self._unchanged >= self.stable_polls else False
+
+
+class script_value_stable:
+    """
+    Wait condition that is met once a JS expression returns the same truthy value for stable_polls polls
+    (e.g. the number of overview anchors, or document.body.scrollHeight).
+    """
+
+    def __init__(self, script, stable_polls=2):
+        self.script = script
+        self.stable_polls = stable_polls
+        self._last = None
+        self._unchanged = 0
+
+    def __call__(self, driver):
+        value = driver.execute_script(self.script)
+        if value and value == self._last:
+            self._unchanged += 1
+        else:
+            self._last, self._unchanged = value, 0
+        return value if self._unchanged >= self.stable_polls else False
+
+
+class script_value_changed:
+    """Wait condition that is met once a JS expression returns something other than initial."""
+
+    def __init__(self, script, initial):
+        self.script = script
+        self.initial = initial
+
+    def __call__(self, driver):
+        value = driver.execute_script(self.script)
+        return value if value != self.initial else False